@@ -0,0 +1,107 @@
+"""
+DynamoDB Scan-to-JSON Benchmark
+===============================
+Compares the resource-layer read path (TypeDeserializer -> Decimal ->
+XomperJSONEncoder) against dynamo_helpers.fast_deserialize_item (plain
+int/float -> json).
+
+Usage:
+    # Offline, synthetic player-shaped items
+    python benchmarks/dynamo_deserialize_benchmark.py --items 10000
+
+    # Offline, real items from a dynamo_helpers.export_table snapshot
+    python benchmarks/dynamo_deserialize_benchmark.py --file players.jsonl.gz
+
+    # Against a real table (needs AWS credentials)
+    python benchmarks/dynamo_deserialize_benchmark.py --table xomper-players
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('AWS_ACCOUNT_ID', '000000000000')
+os.environ.setdefault('DYNAMODB_KMS_ALIAS', 'alias/benchmark')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from lambdas.common.dynamo_helpers import fast_deserialize_item, full_table_scan, fast_table_scan, iter_export_file
+from lambdas.common.utility_helpers import json_dumps
+
+
+def synthetic_items(count: int) -> list:
+    """Low-level (wire format) items shaped like a players table row."""
+    return [
+        {
+            'player_id': {'S': str(i)},
+            'last_updated': {'S': '2026-01-01T00:00:00'},
+            'data': {'M': {
+                'first_name': {'S': 'John'},
+                'last_name': {'S': f'Player{i}'},
+                'position': {'S': 'RB'},
+                'team': {'S': 'NYG'},
+                'age': {'N': str(20 + i % 15)},
+                'years_exp': {'N': str(i % 12)},
+                'search_rank': {'N': str(i)},
+                'depth_chart_order': {'N': str(i % 4)},
+                'height': {'S': '72'},
+                'weight': {'S': '215'},
+                'fantasy_positions': {'L': [{'S': 'RB'}, {'S': 'WR'}]},
+                'metadata': {'M': {'rookie_year': {'S': '2021'}, 'adp': {'N': f'{i / 7:.3f}'}}},
+            }},
+        }
+        for i in range(count)
+    ]
+
+
+def time_it(label: str, fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<40} {best * 1000:>9.1f} ms")
+    return best
+
+
+def run_offline(raw: list, repeat: int):
+    count = len(raw)
+    deserializer = TypeDeserializer()
+
+    def resource_path():
+        items = [{k: deserializer.deserialize(v) for k, v in item.items()} for item in raw]
+        return json_dumps(items)
+
+    def fast_path():
+        return json_dumps([fast_deserialize_item(item) for item in raw])
+
+    print(f"Deserialize + JSON encode {count} items (best of {repeat}):")
+    baseline = time_it("resource path (Decimal + encoder)", resource_path, repeat)
+    fast = time_it("fast path (int/float)", fast_path, repeat)
+    print(f"Speedup: {baseline / fast:.2f}x")
+
+
+def run_table(table_name: str, repeat: int):
+    print(f"Scan + JSON encode {table_name} (best of {repeat}):")
+    baseline = time_it("full_table_scan + json_dumps", lambda: json_dumps(full_table_scan(table_name)), repeat)
+    fast = time_it("fast_table_scan + json_dumps", lambda: json_dumps(fast_table_scan(table_name)), repeat)
+    print(f"Speedup: {baseline / fast:.2f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=10000, help='Synthetic item count (offline mode)')
+    parser.add_argument('--file', help='Benchmark items from an export_table snapshot instead of synthetic items')
+    parser.add_argument('--table', help='Benchmark a real table instead of synthetic items')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.table:
+        run_table(args.table, args.repeat)
+    elif args.file:
+        run_offline(list(iter_export_file(args.file)), args.repeat)
+    else:
+        run_offline(synthetic_items(args.items), args.repeat)
@@ -0,0 +1,85 @@
+"""
+Handler Import-Time Report
+==========================
+Cold-import each handler in a fresh interpreter under `python -X importtime`
+and report the total import cost plus the heaviest modules it pulled in.
+Module import time includes module-level work such as boto3 client creation.
+
+Usage:
+    python benchmarks/import_time_report.py               # markdown table to stdout
+    python benchmarks/import_time_report.py --runs 7 --top 8
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LAMBDAS_DIR = os.path.join(ROOT, 'lambdas')
+
+# Import-time config only - no AWS calls should be needed just to import a handler
+ENV_DEFAULTS = {
+    'AWS_ACCOUNT_ID': '000000000000',
+    'DYNAMODB_KMS_ALIAS': 'alias/benchmark',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'benchmark',
+    'AWS_SECRET_ACCESS_KEY': 'benchmark',
+}
+
+
+def handler_modules() -> list:
+    return sorted(
+        f"lambdas.{name}.handler"
+        for name in os.listdir(LAMBDAS_DIR)
+        if name != 'common' and os.path.isfile(os.path.join(LAMBDAS_DIR, name, 'handler.py'))
+    )
+
+
+def import_once(module: str) -> dict:
+    """Returns {'total_ms', 'modules': {name: cumulative_us}, 'error'} for one cold import."""
+    env = {**ENV_DEFAULTS, **os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    modules = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        total_us += int(self_us)
+        modules[name.strip()] = int(cumulative_us)
+    error = None
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.strip().splitlines() if not line.startswith('import time:')]
+        error = (lines or ['unknown error'])[-1]
+    return {'total_ms': total_us / 1000, 'modules': modules, 'error': error}
+
+
+def report(runs: int, top: int):
+    print(f"| Handler | Import ms (median of {runs}) | Modules | Heaviest imports (cumulative ms) |")
+    print("| ------- | ---: | ---: | ------- |")
+    for module in handler_modules():
+        samples = [import_once(module) for _ in range(runs)]
+        median = statistics.median(sample['total_ms'] for sample in samples)
+        last = samples[-1]
+        # Only top-level packages and our own modules - avoids listing every botocore submodule
+        interesting = {
+            name: us for name, us in last['modules'].items()
+            if '.' not in name or name.startswith('lambdas.common')
+        }
+        heaviest = sorted(interesting.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        heaviest_str = ', '.join(f"`{name}` {us / 1000:.0f}" for name, us in heaviest)
+        note = f" (import failed: {last['error']})" if last['error'] else ''
+        print(f"| `{module}` | {median:.0f}{note} | {len(last['modules'])} | {heaviest_str} |")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=6)
+    args = parser.parse_args()
+    report(args.runs, args.top)
@@ -2,7 +2,9 @@
 
 import jwt
 from lambdas.common.constants import PRODUCT
-from lambdas.common.ssm_helpers import API_SECRET_KEY
+from lambdas.common import ssm_helpers
+from lambdas.common.prewarm import PREWARM_REGISTRY, register_prewarm, start_prewarm
+from lambdas.common.warmer import warm_ping_handler
 from lambdas.common.errors import LambdaAuthorizerError
 from lambdas.common.logger import get_logger
 
@@ -10,7 +12,14 @@ log = get_logger(__file__)
 
 HANDLER = 'authorizer'
 
-def generate_policy(effect, resource):
+# Token claims that carry the caller's Sleeper user id, passed to handlers as
+# requestContext.authorizer.user_id (first one present wins)
+CALLER_ID_CLAIMS = ('user_id', 'sub')
+
+# Fetch the JWT secret during init rather than on the first token
+register_prewarm('api_secret_key', lambda: ssm_helpers.API_SECRET_KEY)
+
+def generate_policy(effect, resource, context=None):
     #Return a valid AWS policy response
     #auth_response = {'principalId': principal_id}
     auth_response = {
@@ -26,6 +35,8 @@ def generate_policy(effect, resource):
             ]
         }
     }
+    if context:
+        auth_response['context'] = context
     return auth_response
 
 def decode_auth_token(auth_token):
@@ -33,8 +44,8 @@ def decode_auth_token(auth_token):
     try:
         # remove "Bearer " from the token string.
         auth_token = auth_token.replace('Bearer ', '')
-        # decode using system environ $SECRET_KEY, will crash if not set.
-        return jwt.decode(auth_token, API_SECRET_KEY, algorithms=['HS256'])
+        # decode using the SSM API secret (fetched on first use, cached per container).
+        return jwt.decode(auth_token, ssm_helpers.API_SECRET_KEY, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         'Signature expired. Please log in again.'
         return
@@ -42,7 +53,9 @@ def decode_auth_token(auth_token):
         'Invalid token. Please log in again.'
         return
     
+@warm_ping_handler(HANDLER)
 def handler(event, context):
+    PREWARM_REGISTRY.report_first_request()
     try:
         method_arn = event.get('methodArn', '')
         auth_token = event.get('authorizationToken', '')
@@ -55,7 +68,8 @@ def handler(event, context):
                 # Construct: arn:aws:execute-api:region:account:apiId/stage/*
                 resource_arn = f"{arn_parts[0]}:{arn_parts[1]}:{arn_parts[2]}:{arn_parts[3]}:{arn_parts[4]}:{api_gateway_arn_tmp[0]}/{api_gateway_arn_tmp[1]}/*"
                 
-                return generate_policy('Allow', resource_arn)
+                caller_id = next((str(user_details[claim]) for claim in CALLER_ID_CLAIMS if user_details.get(claim)), None)
+                return generate_policy('Allow', resource_arn, {'user_id': caller_id} if caller_id else None)
             
         log.warning("Authroizer: Deny.")
         return generate_policy('Deny', method_arn)
@@ -68,3 +82,7 @@ def handler(event, context):
         error = LambdaAuthorizerError(message, HANDLER, function)
         return generate_policy('Deny', method_arn)
     
+
+
+# Not wrapped in handle_errors, so kick off init-phase prewarming here
+start_prewarm()
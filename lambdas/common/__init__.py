@@ -0,0 +1,40 @@
+"""
+Xomper Common Layer
+===================
+Shared code for all Lambda functions (deployed as a Lambda layer).
+
+Submodules resolve lazily on attribute access, so `from lambdas import common`
+followed by `common.sleeper_helper.get_sleeper_user(...)` only imports
+sleeper_helper (and its dependencies) when that line runs. Direct imports
+(`from lambdas.common.errors import handle_errors`) work as usual.
+"""
+
+import importlib
+
+__all__ = [
+    "aws_clients",
+    "constants",
+    "dynamo_helpers",
+    "email_templates",
+    "errors",
+    "logger",
+    "metrics",
+    "notifications",
+    "prewarm",
+    "rule_helpers",
+    "ses_helper",
+    "sleeper_helper",
+    "ssm_helpers",
+    "utility_helpers",
+    "warmer",
+]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,68 @@
+"""
+Xomper AWS Clients
+==================
+Lazily created boto3 clients/resources.
+
+Importing boto3 and building a client (endpoint + service model load) costs
+hundreds of milliseconds, so helpers create them on first use instead of at
+import. A handler that never sends an email never pays for SES.
+
+Usage:
+    ses_client = lazy_client('ses', region_name=AWS_DEFAULT_REGION)
+    ses_client.send_email(...)   # boto3 imported + client built here, once
+"""
+
+import threading
+from typing import Callable, Optional
+
+# boto3's default session isn't thread-safe while building clients - serialize creation
+# (prewarm threads and worker pools can race on first use)
+_CREATE_LOCK = threading.Lock()
+
+
+class LazyClient:
+    """
+    Stand-in for a boto3 client/resource that builds it on first attribute access.
+    Creation is locked so worker threads racing on first use share one client.
+    """
+
+    def __init__(self, factory: Callable, on_create: Optional[Callable] = None):
+        self._factory = factory
+        self._on_create = on_create
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_created(self) -> bool:
+        return self._instance is not None
+
+    def get(self):
+        """Return the real client, creating it if needed."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    with _CREATE_LOCK:
+                        instance = self._factory()
+                    if self._on_create:
+                        self._on_create(instance)
+                    self._instance = instance
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+def lazy_client(service_name: str, on_create: Optional[Callable] = None, **kwargs) -> LazyClient:
+    """boto3.client(service_name, **kwargs), created on first use."""
+    def factory():
+        import boto3
+        return boto3.client(service_name, **kwargs)
+    return LazyClient(factory, on_create)
+
+
+def lazy_resource(service_name: str, on_create: Optional[Callable] = None, **kwargs) -> LazyClient:
+    """boto3.resource(service_name, **kwargs), created on first use."""
+    def factory():
+        import boto3
+        return boto3.resource(service_name, **kwargs)
+    return LazyClient(factory, on_create)
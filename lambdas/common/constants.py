@@ -12,11 +12,22 @@ RESPONSE_HEADERS = {
     "Content-Type": "application/json"
 }
 
+# Pagination - cursor signing key, falls back to a key derived from the SSM API secret when unset
+CURSOR_SECRET_KEY = os.environ.get('CURSOR_SECRET_KEY')
+
 # Logging
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 
 # Dynamodb
 DYNAMODB_KMS_ALIAS = os.environ['DYNAMODB_KMS_ALIAS']
+SLEEPER_CACHE_TABLE_NAME = os.environ.get('SLEEPER_CACHE_TABLE_NAME', f'{PRODUCT}-sleeper-cache')
+SLEEPER_CACHE_TABLE_ENABLED = os.environ.get('SLEEPER_CACHE_TABLE_ENABLED', 'true').lower() == 'true'
+PLAYERS_TABLE_NAME = os.environ.get('PLAYERS_TABLE_NAME', f'{PRODUCT}-players')
+USERS_TABLE_NAME = os.environ.get('USERS_TABLE_NAME', f'{PRODUCT}-users')
+TABLE_ALIASES_TABLE_NAME = os.environ.get('TABLE_ALIASES_TABLE_NAME', f'{PRODUCT}-table-aliases')
+# Logical table names that may be swapped by reset_table_versioned (comma separated) - only these are alias-resolved
+ALIASED_TABLES = frozenset(name.strip() for name in os.environ.get('ALIASED_TABLES', '').split(',') if name.strip())
+RULE_PROPOSALS_TABLE_NAME = os.environ.get('RULE_PROPOSALS_TABLE_NAME', f'{PRODUCT}-rule-proposals')
 
 # Email Service
 FROM_EMAIL = os.environ.get('FROM_EMAIL', 'noreply@xomper.xomware.com')
@@ -25,3 +36,7 @@ XOMPER_URL = "https://xomper.xomware.com"
 # LOGO URL
 LOGO_URL = f"{XOMPER_URL}/assets/img/xomper-logo.jpg"
 BANNER_LOGO_URL = f"{XOMPER_URL}/assets/img/xomper-banner.jpg"
+
+# Sleeper CDN
+SLEEPER_PLAYER_IMAGE_URL = "https://sleepercdn.com/content/nfl/players/{player_id}.jpg"
+SLEEPER_TEAM_LOGO_URL = "https://sleepercdn.com/images/team_logos/nfl/{team}.png"
@@ -1,27 +1,241 @@
 
+import base64
 import boto3
+import copy
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import queue
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from lambdas.common.constants import AWS_DEFAULT_REGION, DYNAMODB_KMS_ALIAS
+from decimal import Decimal
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+from lambdas.common.aws_clients import lazy_client, lazy_resource
+from lambdas.common.constants import ALIASED_TABLES, AWS_DEFAULT_REGION, DYNAMODB_KMS_ALIAS, TABLE_ALIASES_TABLE_NAME
+from lambdas.common.errors import NotFoundError, ConflictError
 from lambdas.common.logger import get_logger
+from lambdas.common.metrics import CAPACITY_OPERATIONS, current_metrics
+from lambdas.common.prewarm import register_prewarm
+from lambdas.common.utility_helpers import encode_cursor, decode_cursor
 
 log = get_logger(__file__)
 
-dynamodb_res = boto3.resource("dynamodb", region_name=AWS_DEFAULT_REGION)
-dynamodb_client = boto3.client("dynamodb", region_name=AWS_DEFAULT_REGION)
-kms_res = boto3.client("kms")
+
+# Instrumentation - botocore event hooks on both clients, so every helper (and the
+# resource layer / batch_writer underneath them) asks for consumed capacity and is
+# timed without each call site opting in. Figures land in lambdas.common.metrics.
+def _request_table_names(params: dict) -> list:
+    if 'TableName' in params:
+        return [params['TableName']]
+    if 'RequestItems' in params:
+        return list(params['RequestItems'])
+    if 'TransactItems' in params:
+        return sorted({op['TableName'] for item in params['TransactItems'] for op in item.values()})
+    return []
+
+def _response_item_counts(parsed: dict) -> dict:
+    if 'Responses' in parsed and isinstance(parsed['Responses'], dict):
+        return {table: len(items) for table, items in parsed['Responses'].items()}
+    if 'Items' in parsed:
+        return {None: parsed.get('Count', len(parsed['Items']))}
+    return {None: 1 if parsed.get('Item') else 0}
+
+def _before_dynamodb_call(params, model, context, **kwargs):
+    context['metrics_started'] = time.perf_counter()
+    context['metrics_tables'] = _request_table_names(params)
+    context['metrics_continuation'] = 'ExclusiveStartKey' in params
+    if model.name in CAPACITY_OPERATIONS:
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+def _after_dynamodb_call(parsed, model, context, **kwargs):
+    started = context.pop('metrics_started', None)
+    tables = context.pop('metrics_tables', None)
+    if started is None or not tables:
+        return
+    ms = (time.perf_counter() - started) * 1000
+    error = 'Error' in parsed
+    items = {} if error else _response_item_counts(parsed)
+    continuation = context.pop('metrics_continuation', False)
+    metrics = current_metrics()
+    for table_name in tables:
+        metrics.record_call(table_name, model.name, ms, items.get(table_name, items.get(None, 0)), error, continuation)
+    capacity = parsed.get('ConsumedCapacity') or []
+    for entry in capacity if isinstance(capacity, list) else [capacity]:
+        metrics.record_capacity(entry.get('TableName', tables[0]), model.name, float(entry.get('CapacityUnits', 0)))
+
+def _after_dynamodb_call_error(model, context, **kwargs):
+    # Connection-level failures never get a parsed response
+    started = context.pop('metrics_started', None)
+    if started is None:
+        return
+    continuation = context.pop('metrics_continuation', False)
+    for table_name in context.pop('metrics_tables', None) or []:
+        current_metrics().record_call(table_name, model.name, (time.perf_counter() - started) * 1000, error=True, continuation=continuation)
+
+def instrument_dynamodb_client(client):
+    """Record consumed capacity, item counts and latency for every call made on client."""
+    events = client.meta.events
+    events.register('before-parameter-build.dynamodb', _before_dynamodb_call, unique_id='xomper-metrics-before')
+    events.register('after-call.dynamodb', _after_dynamodb_call, unique_id='xomper-metrics-after')
+    events.register('after-call-error.dynamodb', _after_dynamodb_call_error, unique_id='xomper-metrics-error')
+    return client
+
+# Clients are built on first use (see aws_clients) and instrumented as they're created
+dynamodb_res = lazy_resource("dynamodb", region_name=AWS_DEFAULT_REGION, on_create=lambda res: instrument_dynamodb_client(res.meta.client))
+dynamodb_client = lazy_client("dynamodb", region_name=AWS_DEFAULT_REGION, on_create=instrument_dynamodb_client)
+kms_res = lazy_client("kms")
+register_prewarm('dynamodb_resource', dynamodb_res.get)
+register_prewarm('dynamodb_client', dynamodb_client.get)
 
 HANDLER = 'dynamo_helpers'
 
+# Optimistic locking - writers pass the version they read, missing attribute == version 0
+LOCK_VERSION_ATTRIBUTE = 'item_version'
+MAX_SCAN_SEGMENTS = 32
+BATCH_GET_MAX_KEYS = 100
+BATCH_MAX_WORKERS = 8
+BATCH_MAX_RETRIES = 6
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+BATCH_WRITE_MAX_ITEMS = 25
+BULK_WRITE_DEFAULT_SHARDS = 4
+BULK_WRITE_QUEUE_DEPTH = 4
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _serialize_item(item: dict) -> dict:
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+def _deserialize_item(item: dict) -> dict:
+    return decode_item_attributes({k: _deserializer.deserialize(v) for k, v in item.items()})
+
+def _batch_backoff(attempt: int):
+    time.sleep(random.uniform(0, BATCH_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+# Payload Codec - large map/list attributes can be stored as compressed binary
+# (magic prefix + zlib over compact JSON). Every read helper decodes them transparently,
+# and plain map attributes written before the codec existed read back unchanged.
+CODEC_MAGIC = b'XZ1:'
+CODEC_THRESHOLD_BYTES = 1024
+_codec_stats = {'encodedAttributes': 0, 'rawBytes': 0, 'storedBytes': 0, 'estimatedWCUSaved': 0}
+_codec_lock = threading.Lock()
+
+def _codec_json_default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def encode_item_attributes(item: dict, threshold: int = CODEC_THRESHOLD_BYTES, attributes: tuple = None) -> dict:
+    """
+    Copy of item with each map/list attribute (or just `attributes`) whose compact JSON
+    is at least `threshold` bytes replaced by compressed binary - only if that's smaller.
+    Attributes holding sets or binary can't round-trip through JSON and are left as is.
+    """
+    encoded = dict(item)
+    for name, value in item.items():
+        if (attributes is not None and name not in attributes) or not isinstance(value, (dict, list)):
+            continue
+        try:
+            raw = json.dumps(value, separators=(',', ':'), default=_codec_json_default).encode('utf-8')
+        except TypeError:
+            continue
+        if len(raw) < threshold:
+            continue
+        packed = CODEC_MAGIC + zlib.compress(raw)
+        if len(packed) >= len(raw):
+            continue
+        encoded[name] = packed
+        with _codec_lock:
+            _codec_stats['encodedAttributes'] += 1
+            _codec_stats['rawBytes'] += len(raw)
+            _codec_stats['storedBytes'] += len(packed)
+            # Write units are billed per started 1KB of item size
+            _codec_stats['estimatedWCUSaved'] += -(-len(raw) // 1024) - -(-len(packed) // 1024)
+    return encoded
+
+def encode_payload(value) -> bytes:
+    """Always-encoded codec form of a JSON value (no threshold) - for caches storing whole payloads."""
+    return CODEC_MAGIC + zlib.compress(json.dumps(value, separators=(',', ':'), default=_codec_json_default).encode('utf-8'))
+
+def decode_payload(raw: bytes, fast: bool = False):
+    payload = zlib.decompress(raw[len(CODEC_MAGIC):])
+    return json.loads(payload) if fast else json.loads(payload, parse_float=Decimal, parse_int=Decimal)
+
+def decode_item_attributes(item: dict, fast: bool = False) -> dict:
+    """Decode codec attributes in place. fast=True gives int/float instead of Decimal."""
+    if not item:
+        return item
+    for name, value in item.items():
+        raw = value.value if isinstance(value, Binary) else value
+        if isinstance(raw, (bytes, bytearray)) and raw[:len(CODEC_MAGIC)] == CODEC_MAGIC:
+            item[name] = decode_payload(raw, fast)
+    return item
+
+def get_codec_stats() -> dict:
+    """Attributes compressed in this container, bytes before/after and estimated WCU saved."""
+    with _codec_lock:
+        return {**_codec_stats, 'bytesSaved': _codec_stats['rawBytes'] - _codec_stats['storedBytes']}
+
+
+# Table Aliases - a logical table name listed in ALIASED_TABLES can point at a versioned
+# physical table (see reset_table_versioned). Every helper resolves names through here;
+# other names (and aliases with no pointer yet) resolve to themselves without a lookup.
+# Pointers are cached per container, a missing alias table for the life of the container.
+TABLE_ALIAS_CACHE_SECONDS = 30
+TABLE_ALIAS_DROP_GRACE_SECONDS = 2 * TABLE_ALIAS_CACHE_SECONDS
+_alias_cache = {}
+_alias_table_missing = False
+
+def _get_alias_pointer(alias: str) -> dict:
+    response = dynamodb_res.Table(TABLE_ALIASES_TABLE_NAME).get_item(Key={'alias': alias})
+    return response.get('Item') or {}
+
+def resolve_table_name(table_name: str) -> str:
+    global _alias_table_missing
+    if table_name not in ALIASED_TABLES or _alias_table_missing:
+        return table_name
+    cached = _alias_cache.get(table_name)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    try:
+        physical_name = _get_alias_pointer(table_name).get('table_name', table_name)
+    except Exception as err:
+        # Alias table missing or unreachable - fall back to the name as given
+        if isinstance(err, ClientError) and err.response['Error']['Code'] == 'ResourceNotFoundException':
+            log.warning(f"No {TABLE_ALIASES_TABLE_NAME} table - table aliases are off for this container.")
+            _alias_table_missing = True
+        else:
+            log.warning(f"Could not resolve table alias {table_name}: {err}")
+        physical_name = table_name
+    _alias_cache[table_name] = (physical_name, time.monotonic() + TABLE_ALIAS_CACHE_SECONDS)
+    return physical_name
+
+def _table(table_name: str):
+    return dynamodb_res.Table(resolve_table_name(table_name))
+
 # Performs full table scan, and fetches ALL data from table in pages...
+# Pass total_segments > 1 to scan Segment/TotalSegments in parallel threads.
 def full_table_scan(table_name, **kwargs):
     try:
-        table = dynamodb_res.Table(table_name)
-        response = table.scan()
-        data = response['Items']  # We've got our data now!
-        while 'LastEvaluatedKey' in response:  # If we have this field in response...
-            # It tells us where we left off, and signifies there's more data to fetch in "pages" after this particular key.
-            response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            data.extend(response['Items'])  # Add more data as each "page" comes in until we're done (LastEvaluatedKey gone)
+        if kwargs.get('total_segments', 1) > 1:
+            return parallel_table_scan(
+                table_name,
+                kwargs['total_segments'],
+                attribute_name_to_sort_by=kwargs.get('attribute_name_to_sort_by'),
+                is_reverse=kwargs.get('is_reverse', False)
+            )
+
+        data = list(iter_scan(table_name))  # iter_scan follows LastEvaluatedKey page by page for us
 
         # If we passed in these optional keyword args, let's...
         # SORT the data...default is ascending order even if there are no sort args present.
@@ -33,94 +247,415 @@ def full_table_scan(table_name, **kwargs):
     except Exception as err:
         log.error(f"Dynamodb Full Table Scan: {err}")
         raise Exception(f"Dynamodb Full Table Scan: {err}")
-def table_scan_by_ids(table_name, key, ids, goal_filter, **kwargs):
+def _scan_segment(table_name, segment, total_segments, on_page, raw=False):
+    # Low-level client is thread-safe, resource objects are not - deserialize ourselves (raw=True keeps wire format)
+    scan_kwargs = {
+        'TableName': table_name,
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'ReturnConsumedCapacity': 'TOTAL'
+    }
+    stats = {'segment': segment, 'items': 0, 'pages': 0, 'consumedCapacity': 0.0}
+    while True:
+        response = dynamodb_client.scan(**scan_kwargs)
+        items = response['Items'] if raw else [_deserialize_item(item) for item in response['Items']]
+        on_page(segment, items)
+        stats['items'] += len(items)
+        stats['pages'] += 1
+        stats['consumedCapacity'] += response.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+        if 'LastEvaluatedKey' not in response:
+            return stats
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def parallel_table_scan(table_name, total_segments, attribute_name_to_sort_by=None, is_reverse=False):
+    """
+    Full table scan split into total_segments parallel segments.
+
+    Unsorted: pages are appended to the result as they arrive from any segment.
+    Sorted: each segment is sorted on its own and the segments are k-way merged.
+    Logs items/second and consumed capacity per segment.
+    """
     try:
-        table = dynamodb_res.Table(table_name)
-        keys = {
-            table.name: {
-                'Keys': [{key: id} for id in ids]
-            }
-        }
+        total_segments = max(1, min(int(total_segments), MAX_SCAN_SEGMENTS))
+        sort_key = (lambda i: i[attribute_name_to_sort_by]) if attribute_name_to_sort_by else None
+        data = []
+        segment_data = [[] for _ in range(total_segments)]
+        lock = threading.Lock()
+
+        def on_page(segment, items):
+            if sort_key:
+                segment_data[segment].extend(items)
+            else:
+                with lock:
+                    data.extend(items)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            physical_table = resolve_table_name(table_name)
+            futures = [executor.submit(_scan_segment, physical_table, seg, total_segments, on_page) for seg in range(total_segments)]
+            segment_stats = [future.result() for future in futures]
+
+        if sort_key:
+            for items in segment_data:
+                items.sort(key=sort_key, reverse=is_reverse)
+            data = list(heapq.merge(*segment_data, key=sort_key, reverse=is_reverse))
+
+        elapsed = time.perf_counter() - started
+        log.info(
+            f"Parallel scan of {table_name}: {len(data)} items in {elapsed:.2f}s "
+            f"({len(data) / elapsed if elapsed else 0:.0f} items/s) across {total_segments} segments."
+        )
+        for stats in segment_stats:
+            log.info(
+                f"   Segment {stats['segment']}: {stats['items']} items, {stats['pages']} pages, "
+                f"{stats['consumedCapacity']} RCU"
+            )
+        return data
+    except Exception as err:
+        log.error(f"Dynamodb Parallel Table Scan: {err}")
+        raise Exception(f"Dynamodb Parallel Table Scan: {err}")
+
+def _batch_get_chunk(request_items: dict) -> dict:
+    # One BatchGetItem call (<= 100 keys), retrying UnprocessedKeys with backoff
+    results = {}
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        response = dynamodb_client.batch_get_item(RequestItems=request_items)
+        for table_name, items in response.get('Responses', {}).items():
+            results.setdefault(table_name, []).extend(_deserialize_item(item) for item in items)
+        request_items = response.get('UnprocessedKeys') or {}
+        if not request_items:
+            return results
+        if attempt < BATCH_MAX_RETRIES:
+            _batch_backoff(attempt)
+    unprocessed = sum(len(req['Keys']) for req in request_items.values())
+    raise Exception(f"{unprocessed} keys still unprocessed after {BATCH_MAX_RETRIES} retries")
+
+def batch_get_items(requests: dict) -> dict:
+    """
+    Batch get across one or more tables.
+
+    Args:
+        requests: {table_name: (key_name, ids)} - ids are deduped.
+                  Use key_name=None with full key dicts for composite keys.
 
-        response = dynamodb_res.batch_get_item(RequestItems=keys)
-        data = response['Responses'][table.name]
+    Returns:
+        {table_name: [items]} (order not guaranteed, missing ids are skipped)
+    """
+    try:
+        # Requests go out under physical table names, results come back under the names given
+        logical_names = {resolve_table_name(table_name): table_name for table_name in requests}
+
+        # Dedupe on the serialized key so composite (dict) keys work too
+        unique_keys = {}
+        for physical_table, table_name in logical_names.items():
+            key_name, ids = requests[table_name]
+            for id_val in ids:
+                key = _serialize_item(id_val if key_name is None else {key_name: id_val})
+                unique_keys[(physical_table, json.dumps(key, sort_keys=True))] = (physical_table, key)
+        keys = list(unique_keys.values())
+        chunks = []
+        for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            chunk = {}
+            for table_name, key in keys[start:start + BATCH_GET_MAX_KEYS]:
+                chunk.setdefault(table_name, {'Keys': []})['Keys'].append(key)
+            chunks.append(chunk)
 
-        for offering in data:
-            if len(offering['rank_dict']) > 0:
-                offering['rank'] = offering['rank_dict'][goal_filter]
+        results = {table_name: [] for table_name in requests}
+        if not chunks:
+            return results
+        with ThreadPoolExecutor(max_workers=min(len(chunks), BATCH_MAX_WORKERS)) as executor:
+            for chunk_results in executor.map(_batch_get_chunk, chunks):
+                for physical_table, items in chunk_results.items():
+                    results[logical_names[physical_table]].extend(items)
+        return results
+    except Exception as err:
+        log.error(f"Dynamodb Batch Get Items: {err}")
+        raise Exception(f"Dynamodb Batch Get Items: {err}")
+
+# Pass use_rank_index=True to read ranks from the precomputed rank index
+# (see update_ranked_item) instead of copying them out of rank_dict. Results then come
+# back in index order (descending with is_reverse), items with no rank for the goal last.
+def table_scan_by_ids(table_name, key, ids, goal_filter, **kwargs):
+    try:
+        sort_by = kwargs.get('attribute_name_to_sort_by')
+        is_reverse = kwargs.get('is_reverse', False)
+
+        if goal_filter and kwargs.get('use_rank_index'):
+            # Only the requested ids' rank rows are read - not the goal's whole partition
+            ranks = get_ranks_by_ids(table_name, goal_filter, ids)
+            items = batch_get_items({table_name: (key, ids)})[table_name]
+            for item in items:
+                if item[key] in ranks:
+                    item['rank'] = ranks[item[key]]
+            position = {id_val: index for index, id_val in enumerate(ids)}
+            data = sorted((item for item in items if item[key] in ranks), key=lambda i: i['rank'], reverse=is_reverse)
+            data += sorted((item for item in items if item[key] not in ranks), key=lambda i: position.get(i[key], 0))
+            if sort_by in (None, 'rank'):
+                return data
+        else:
+            data = batch_get_items({table_name: (key, ids)})[table_name]
+            for offering in data:
+                if goal_filter and offering.get('rank_dict'):
+                    offering['rank'] = offering['rank_dict'][goal_filter]
 
         # Sort data
-        if 'attribute_name_to_sort_by' in kwargs:
-            is_reverse = kwargs['is_reverse'] if 'is_reverse' in kwargs else False
-            data = sorted(data, key=lambda i: i[kwargs['attribute_name_to_sort_by']], reverse=is_reverse)
+        if sort_by:
+            data = sorted(data, key=lambda i: i[sort_by], reverse=is_reverse)
 
         return data
     except Exception as err:
         log.error(f"Dynamodb Table Scan by IDs: {err}")
         raise Exception(f"Dynamodb Table Scan by IDs: {err}")
 
-# Update Entire Table Item - Send in full dict of item
-def delete_table_item(table_name, primary_key, primary_key_value):
+def _is_condition_failure(err) -> bool:
+    return isinstance(err, ClientError) and err.response['Error']['Code'] == 'ConditionalCheckFailedException'
+
+def _version_condition(expected_version: int):
+    condition = Attr(LOCK_VERSION_ATTRIBUTE).eq(expected_version)
+    if expected_version == 0:
+        condition = condition | Attr(LOCK_VERSION_ATTRIBUTE).not_exists()
+    return condition
+
+def _raise_condition_failure(err, table_name, function, key_val, expected_version=None):
+    # With ReturnValuesOnConditionCheckFailure=ALL_OLD an existing item comes back on failure,
+    # so we can tell "doesn't exist" apart from "someone else wrote first"
+    if expected_version is not None and err.response.get('Item'):
+        raise ConflictError(
+            f"Item ({key_val}) was modified by another writer (expected version {expected_version})",
+            HANDLER, function, resource=table_name
+        )
+    raise NotFoundError(f"Invalid ID ({key_val}): Item Does not Exist.", HANDLER, function, resource=table_name)
+
+# Delete Table Item - existence (and optional version) checked atomically by the delete itself
+def delete_table_item(table_name, primary_key, primary_key_value, expected_version=None):
     try:
-        check_if_item_exist(table_name, primary_key, primary_key_value)
-        table = dynamodb_res.Table(table_name)
+        condition = Attr(primary_key).exists()
+        if expected_version is not None:
+            condition = condition & _version_condition(expected_version)
+
+        table = _table(table_name)
         response = table.delete_item(
             Key={
                 primary_key: primary_key_value
-            }
+            },
+            ConditionExpression=condition,
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
         )
+        invalidate_item_cache(table_name, {primary_key: primary_key_value})
         return response
     except Exception as err:
+        if _is_condition_failure(err):
+            _raise_condition_failure(err, table_name, 'delete_table_item', primary_key_value, expected_version)
         log.error(f"Dynamodb Table Delete Table Item: {err}")
         raise Exception(f"Dynamodb Table Delete Table Item: {err}")
 
 
 # Update Entire Table Item - Send in full dict of item
-def update_table_item(table_name, table_item):
+# Pass expected_version (0 for a new item) to only write if nobody else has since.
+# compress=True stores large map/list attributes as compressed binary (see encode_item_attributes).
+def update_table_item(table_name, table_item, expected_version=None, compress=False):
     try:
-        table = dynamodb_res.Table(table_name)
+        table = _table(table_name)
+        if compress:
+            table_item = encode_item_attributes(table_item)
+        put_kwargs = {}
+        if expected_version is not None:
+            table_item = {**table_item, LOCK_VERSION_ATTRIBUTE: expected_version + 1}
+            put_kwargs = {
+                'ConditionExpression': _version_condition(expected_version),
+                'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+            }
         response = table.put_item(
-            Item=table_item
+            Item=table_item,
+            **put_kwargs
         )
+        invalidate_item_cache(table_name, table_item)
         return response
     except Exception as err:
+        if _is_condition_failure(err):
+            raise ConflictError(
+                f"Item was modified by another writer (expected version {expected_version})",
+                HANDLER, 'update_table_item', resource=table_name
+            )
         log.error(f"Dynamodb Table Update Table Item: {err}")
         raise Exception(f"Dynamodb Table Update Table Item: {err}")
 
 
 # Update single field of Table - send in one attribute and key
-def update_table_item_field(table_name, primary_key, primary_key_value, attr_key, attr_val):
+# Existence (and optional version) is checked atomically by the update itself.
+def update_table_item_field(table_name, primary_key, primary_key_value, attr_key, attr_val, expected_version=None):
     try:
-        check_if_item_exist(table_name, primary_key, primary_key_value)
+        update_expression = "set #attr_key = :attr_val"
+        condition = Attr(primary_key).exists()
+        attribute_names = {'#attr_key': attr_key}
+        attribute_values = {':attr_val': attr_val}
+        if expected_version is not None:
+            update_expression += ", #lock_version = :next_version"
+            condition = condition & _version_condition(expected_version)
+            attribute_names['#lock_version'] = LOCK_VERSION_ATTRIBUTE
+            attribute_values[':next_version'] = expected_version + 1
 
-        table = dynamodb_res.Table(table_name)
+        table = _table(table_name)
         response = table.update_item(
             Key={
                 primary_key: primary_key_value
             },
-            UpdateExpression="set #attr_key = :attr_val",
-            ExpressionAttributeValues={
-                ':attr_val': attr_val
-            },
-            ExpressionAttributeNames={
-                '#attr_key': attr_key
-            },
-            ReturnValues="UPDATED_NEW"
+            UpdateExpression=update_expression,
+            ConditionExpression=condition,
+            ExpressionAttributeValues=attribute_values,
+            ExpressionAttributeNames=attribute_names,
+            ReturnValues="UPDATED_NEW",
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
         )
+        invalidate_item_cache(table_name, {primary_key: primary_key_value})
         return response
     except Exception as err:
+        if _is_condition_failure(err):
+            _raise_condition_failure(err, table_name, 'update_table_item_field', primary_key_value, expected_version)
         log.error(f"Dynamodb Table Update Table Item Field: {err}")
         raise Exception(f"Dynamodb Table Update Table Item Field: {err}")
 
-def check_if_item_exist(table_name, id_key, id_val, override=False):
+# Add a member to a string set (plus an ADD to a counter) in one UpdateItem - no read-modify-write.
+# The condition rejects a member already in set_attr or any of exclusive_set_attrs (e.g. the
+# other side of a vote) with ConflictError; a missing item raises NotFoundError.
+# labels_attr/label optionally records a display label for the member in a map attribute.
+def add_unique_set_member(table_name, primary_key, primary_key_value, set_attr, member, count_attr=None, exclusive_set_attrs=(), labels_attr=None, label=None):
     try:
-        table = dynamodb_res.Table(table_name)
-        response = table.get_item(
+        update_expression = "ADD #set_attr :member_set"
+        condition = Attr(primary_key).exists()
+        for attr in (set_attr, *exclusive_set_attrs):
+            condition = condition & ~Attr(attr).contains(member)
+        attribute_names = {'#set_attr': set_attr}
+        attribute_values = {':member_set': {member}}
+        if count_attr:
+            update_expression += ", #count_attr :one"
+            attribute_names['#count_attr'] = count_attr
+            attribute_values[':one'] = 1
+        if labels_attr:
+            update_expression += " SET #labels_attr.#member = :label"
+            attribute_names.update({'#labels_attr': labels_attr, '#member': member})
+            attribute_values[':label'] = label if label is not None else member
+
+        table = _table(table_name)
+        response = table.update_item(
             Key={
-                id_key: id_val,
-            }
+                primary_key: primary_key_value
+            },
+            UpdateExpression=update_expression,
+            ConditionExpression=condition,
+            ExpressionAttributeValues=attribute_values,
+            ExpressionAttributeNames=attribute_names,
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
         )
-        if 'Item' in response:
+        invalidate_item_cache(table_name, {primary_key: primary_key_value})
+        return decode_item_attributes(response.get('Attributes'))
+    except Exception as err:
+        if _is_condition_failure(err):
+            if err.response.get('Item'):
+                raise ConflictError(
+                    f"{member} is already recorded on item ({primary_key_value})",
+                    HANDLER, 'add_unique_set_member', resource=table_name
+                )
+            _raise_condition_failure(err, table_name, 'add_unique_set_member', primary_key_value)
+        log.error(f"Dynamodb Add Unique Set Member: {err}")
+        raise Exception(f"Dynamodb Add Unique Set Member: {err}")
+
+# Item Cache - opt-in per table read-through LRU with a TTL, misses are cached too.
+# Writes through update_table_item / update_table_item_field / delete_table_item in
+# this container invalidate the entry; writes from other containers are only seen after the TTL.
+# Every invalidation bumps a generation counter so a read that started before the
+# invalidating write can't put the old item back (same as SleeperCache).
+class ItemCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.stats = {"hits": 0, "negativeHits": 0, "misses": 0, "invalidations": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        """Returns (found, item) - found with item None is a cached miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats["hits" if entry[0] is not None else "negativeHits"] += 1
+                return True, copy.deepcopy(entry[0])
+            if entry:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return False, None
+
+    def put(self, key: tuple, item, generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (copy.deepcopy(item), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, attributes: dict = None):
+        """Drop entries whose key attributes all match `attributes` (everything if None)."""
+        with self._lock:
+            self.generation += 1
+            self.stats["invalidations"] += 1
+            if attributes is None:
+                self._entries.clear()
+                return
+            stale = [key for key in self._entries if all(attributes.get(name) == val for name, val in key)]
+            for key in stale:
+                del self._entries[key]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["negativeHits"] + self.stats["misses"]
+            served = self.stats["hits"] + self.stats["negativeHits"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hitRatio": round(served / lookups, 3) if lookups else 0.0,
+            }
+
+_item_caches = {}
+
+def enable_item_cache(table_name: str, max_entries: int = 256, ttl_seconds: float = 60):
+    _item_caches[table_name] = ItemCache(max_entries, ttl_seconds)
+
+def disable_item_cache(table_name: str):
+    _item_caches.pop(table_name, None)
+
+def invalidate_item_cache(table_name: str, attributes: dict = None):
+    cache = _item_caches.get(table_name)
+    if cache:
+        cache.invalidate(attributes)
+
+def get_item_cache_stats() -> dict:
+    """Per-table hit ratio and counters for every table with the item cache enabled."""
+    return {table_name: cache.metrics() for table_name, cache in _item_caches.items()}
+
+def _get_item(table_name: str, key: dict):
+    # Single get_item through the table's item cache (if enabled) - None when missing
+    cache = _item_caches.get(table_name)
+    cache_key = tuple(sorted(key.items()))
+    if cache:
+        found, item = cache.get(cache_key)
+        if found:
+            return item
+        generation = cache.generation
+
+    table = _table(table_name)
+    item = decode_item_attributes(table.get_item(Key=key).get('Item'))
+    if cache:
+        cache.put(cache_key, item, generation)
+    return item
+
+def check_if_item_exist(table_name, id_key, id_val, override=False):
+    try:
+        item = _get_item(table_name, {id_key: id_val})
+        if item is not None:
             return True
         elif override:
             return False
@@ -130,17 +665,13 @@ def check_if_item_exist(table_name, id_key, id_val, override=False):
         log.error(f"Dynamodb Table Check If Item Exists: {err}")
         raise Exception(f"Dynamodb Table Check If Item Exists: {err}")
 
-def get_item_by_key(table_name, id_key, id_val):
+def get_item_by_key(table_name, id_key, id_val, override=False):
     try:
-
-        table = dynamodb_res.Table(table_name)
-        response = table.get_item(
-            Key={
-                id_key: id_val,
-            }
-        )
-        if 'Item' in response:
-            return response['Item']
+        item = _get_item(table_name, {id_key: id_val})
+        if item is not None:
+            return item
+        elif override:
+            return {}
         else:
             raise Exception("Invalid ID (" + id_val + "): Item Does not Exist.")
     except Exception as err:
@@ -149,19 +680,13 @@ def get_item_by_key(table_name, id_key, id_val):
     
 def get_item_by_multiple_keys(table_name: str, id_partition_key: str, id_partition_val: str, id_sort_key: str, id_sort_val: str):
     try:
-
-        table = dynamodb_res.Table(table_name)
-        response = table.get_item(
-            Key={
-                id_partition_key: id_partition_val,
-                id_sort_key: id_sort_val            
-            }
-        )
-
-        item = response.get('Item')
+        item = _get_item(table_name, {
+            id_partition_key: id_partition_val,
+            id_sort_key: id_sort_val
+        })
         if item:
             log.info("Item Found in table.")
-            return response['Item']
+            return item
         else:
             log.warning(f"Invalid IDs ({id_partition_key} - {id_sort_key}): Item Does not Exist.")
             return {}
@@ -169,17 +694,154 @@ def get_item_by_multiple_keys(table_name: str, id_partition_key: str, id_partiti
         log.error(f"Dynamodb Table Get Item By Multipe Keys: {err}")
         raise Exception(f"Dynamodb Table Get Item By Multipe Keys: {err}")
 
+# Lazy scan/query generators - yield items page by page, following LastEvaluatedKey.
+# Extra kwargs go straight to DynamoDB (ProjectionExpression, FilterExpression,
+# ExpressionAttributeNames, Limit = page size...). max_items stops early.
+def _iter_pages(operation, max_items=None, **request_kwargs):
+    yielded = 0
+    while True:
+        response = operation(**request_kwargs)
+        for item in response['Items']:
+            yield item
+            yielded += 1
+            if max_items and yielded >= max_items:
+                return
+        if 'LastEvaluatedKey' not in response:
+            return
+        request_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def iter_scan(table_name, max_items=None, **scan_kwargs):
+    try:
+        table = _table(table_name)
+        for item in _iter_pages(table.scan, max_items, **scan_kwargs):
+            yield decode_item_attributes(item)
+    except Exception as err:
+        log.error(f"Dynamodb Iter Scan: {err}")
+        raise Exception(f"Dynamodb Iter Scan: {err}")
+
+def iter_query(table_name, id_key, id_val, ascending=False, max_items=None, **query_kwargs):
+    try:
+        table = _table(table_name)
+        items = _iter_pages(
+            table.query,
+            max_items,
+            KeyConditionExpression=boto3.dynamodb.conditions.Key(id_key).eq(id_val),
+            ScanIndexForward=ascending,
+            **query_kwargs
+        )
+        for item in items:
+            yield decode_item_attributes(item)
+    except Exception as err:
+        log.error(f"Dynamodb Iter Query: {err}")
+        raise Exception(f"Dynamodb Iter Query: {err}")
+
+# Fast read path - low-level client + a plain-Python deserializer. Numbers come back as
+# int (no fraction/exponent) or float instead of Decimal, so results json.dumps directly.
+# number_types overrides the conversion per top-level attribute, e.g. {'rank': Decimal}.
+# Expressions must be strings here (no boto3.dynamodb.conditions objects).
+def _fast_number(raw: str):
+    if '.' in raw or 'e' in raw or 'E' in raw:
+        return float(raw)
+    return int(raw)
+
+def _fast_value(value: dict, number=_fast_number):
+    (value_type, raw), = value.items()
+    if value_type == 'S':
+        return raw
+    if value_type == 'N':
+        return number(raw)
+    if value_type == 'M':
+        return {k: _fast_value(v, number) for k, v in raw.items()}
+    if value_type == 'L':
+        return [_fast_value(v, number) for v in raw]
+    if value_type == 'NULL':
+        return None
+    if value_type == 'NS':
+        return {number(n) for n in raw}
+    if value_type in ('SS', 'BS'):
+        return set(raw)
+    return raw  # BOOL, B
+
+def fast_deserialize_item(item: dict, number_types: dict = None) -> dict:
+    if not number_types:
+        return decode_item_attributes({k: _fast_value(v) for k, v in item.items()}, fast=True)
+    return decode_item_attributes({k: _fast_value(v, number_types.get(k, _fast_number)) for k, v in item.items()}, fast=True)
+
+def get_item_by_key_fast(table_name, id_key, id_val, number_types=None):
+    """get_item_by_key through the fast read path ({} when missing). Skips the item cache."""
+    try:
+        response = dynamodb_client.get_item(
+            TableName=resolve_table_name(table_name),
+            Key={id_key: _serializer.serialize(id_val)}
+        )
+        item = response.get('Item')
+        return fast_deserialize_item(item, number_types) if item else {}
+    except Exception as err:
+        log.error(f"Dynamodb Get Item By Key Fast: {err}")
+        raise Exception(f"Dynamodb Get Item By Key Fast: {err}")
+
+def iter_scan_fast(table_name, number_types=None, max_items=None, **scan_kwargs):
+    try:
+        pages = _iter_pages(dynamodb_client.scan, max_items, TableName=resolve_table_name(table_name), **scan_kwargs)
+        for item in pages:
+            yield fast_deserialize_item(item, number_types)
+    except Exception as err:
+        log.error(f"Dynamodb Iter Scan Fast: {err}")
+        raise Exception(f"Dynamodb Iter Scan Fast: {err}")
+
+def fast_table_scan(table_name, number_types=None, **scan_kwargs):
+    return list(iter_scan_fast(table_name, number_types, **scan_kwargs))
+
 def query_table_by_key(table_name, id_key, id_val, ascending=False):
     try:
-        table = dynamodb_res.Table(table_name)
+        table = _table(table_name)
         response = table.query(
             KeyConditionExpression=boto3.dynamodb.conditions.Key(id_key).eq(id_val),
             ScanIndexForward=ascending
         )
+        response['Items'] = [decode_item_attributes(item) for item in response['Items']]
         return response
     except Exception as err:
         log.error(f"Dynamodb Table Query Table By Key: {err}")
         raise Exception(f"Dynamodb Query Table Item By Key: {err}")
+
+# Paginated query - one DynamoDB page per call. The cursor is the page's LastEvaluatedKey
+# in wire format (binary values base64'd, as in exports), signed and scoped to this
+# table/index/key so it can't be replayed elsewhere.
+def _page_scope(table_name, id_key, id_val, index_name):
+    return f"{table_name}|{index_name or ''}|{id_key}={id_val}"
+
+def _key_to_cursor_position(last_key: dict) -> dict:
+    return {k: _wire_to_json(v) for k, v in _serialize_item(last_key).items()}
+
+def _cursor_position_to_key(position: dict) -> dict:
+    return {k: _deserializer.deserialize(_json_to_wire(v)) for k, v in position.items()}
+
+def query_table_page(table_name, id_key, id_val, limit, cursor=None, ascending=False, index_name=None, **query_kwargs):
+    """
+    Returns (items, next_cursor) for at most `limit` items; next_cursor is None on the last page.
+    Pair with utility_helpers.get_pagination_params / success_response(next_cursor=...).
+    """
+    scope = _page_scope(table_name, id_key, id_val, index_name)
+    if cursor:
+        query_kwargs['ExclusiveStartKey'] = _cursor_position_to_key(decode_cursor(cursor, scope))
+    if index_name:
+        query_kwargs['IndexName'] = index_name
+    try:
+        table = _table(table_name)
+        response = table.query(
+            KeyConditionExpression=boto3.dynamodb.conditions.Key(id_key).eq(id_val),
+            ScanIndexForward=ascending,
+            Limit=limit,
+            **query_kwargs
+        )
+        items = [decode_item_attributes(item) for item in response['Items']]
+        last_key = response.get('LastEvaluatedKey')
+        return items, encode_cursor(_key_to_cursor_position(last_key), scope) if last_key else None
+    except Exception as err:
+        log.error(f"Dynamodb Query Table Page: {err}")
+        raise Exception(f"Dynamodb Query Table Page: {err}")
+
 def item_has_property(item, property):
     for field in item:
         if field == property:
@@ -187,6 +849,8 @@ def item_has_property(item, property):
 
     return False
 
+# Empty Table - deletes and recreates the table, so readers see it missing in between
+# (reset_table_versioned is the opt-in zero-downtime version)
 def emptyTable(table_name, hash_key, hash_key_type):
     try:
         deleteTable(table_name)
@@ -196,13 +860,160 @@ def emptyTable(table_name, hash_key, hash_key_type):
         log.error(f"Dynamodb Table Empty Table: {err}")
         raise Exception(f"Dynamodb Table Empty Table: {err}")
 
+def _table_config(table_name: str) -> dict:
+    """create_table kwargs reproducing a table's keys, indexes, stream, encryption, billing and class."""
+    table = dynamodb_client.describe_table(TableName=table_name)['Table']
+    billing_mode = table.get('BillingModeSummary', {}).get('BillingMode', 'PROVISIONED')
+
+    def throughput(description: dict) -> dict:
+        return {key: description['ProvisionedThroughput'][key] for key in ('ReadCapacityUnits', 'WriteCapacityUnits')}
+
+    config = {
+        'KeySchema': table['KeySchema'],
+        'AttributeDefinitions': table['AttributeDefinitions'],
+        'BillingMode': billing_mode,
+    }
+    if billing_mode == 'PROVISIONED':
+        config['ProvisionedThroughput'] = throughput(table)
+    if table.get('LocalSecondaryIndexes'):
+        config['LocalSecondaryIndexes'] = [
+            {key: index[key] for key in ('IndexName', 'KeySchema', 'Projection')}
+            for index in table['LocalSecondaryIndexes']
+        ]
+    if table.get('GlobalSecondaryIndexes'):
+        config['GlobalSecondaryIndexes'] = [
+            {
+                **{key: index[key] for key in ('IndexName', 'KeySchema', 'Projection')},
+                **({'ProvisionedThroughput': throughput(index)} if billing_mode == 'PROVISIONED' else {})
+            }
+            for index in table['GlobalSecondaryIndexes']
+        ]
+    if table.get('StreamSpecification', {}).get('StreamEnabled'):
+        config['StreamSpecification'] = table['StreamSpecification']
+    sse = table.get('SSEDescription') or {}
+    if sse.get('SSEType') == 'KMS' and sse.get('KMSMasterKeyArn'):
+        config['SSESpecification'] = {'Enabled': True, 'SSEType': 'KMS', 'KMSMasterKeyId': sse['KMSMasterKeyArn']}
+    if table.get('TableClassSummary', {}).get('TableClass'):
+        config['TableClass'] = table['TableClassSummary']['TableClass']
+    return config
+
+def _copy_time_to_live(source_table: str, target_table: str):
+    ttl = dynamodb_client.describe_time_to_live(TableName=source_table)['TimeToLiveDescription']
+    if ttl.get('TimeToLiveStatus') in ('ENABLED', 'ENABLING'):
+        dynamodb_client.update_time_to_live(
+            TableName=target_table,
+            TimeToLiveSpecification={'Enabled': True, 'AttributeName': ttl['AttributeName']}
+        )
+
+def _retired_table_age_seconds(pointer: dict) -> float:
+    updated_at = pointer.get('updated_at')
+    if not updated_at:
+        return float('inf')
+    return (datetime.utcnow() - datetime.fromisoformat(updated_at)).total_seconds()
+
+def _undropped_retired_table(alias: str, pointer: dict):
+    # The version retired by the last swap, if it still exists (never version 0)
+    previous_table = pointer.get('previous_table_name')
+    if not previous_table or previous_table in (pointer.get('table_name'), alias):
+        return None
+    try:
+        dynamodb_client.describe_table(TableName=previous_table)
+    except dynamodb_client.exceptions.ResourceNotFoundException:
+        return None
+    return previous_table
+
+def drop_retired_table(alias: str, pointer: dict = None) -> bool:
+    """
+    Drop the version retired by the last swap once every container's cached pointer has
+    moved on (TABLE_ALIAS_DROP_GRACE_SECONDS). Version 0 - the table named `alias`, which
+    infrastructure-as-code owns - is never dropped. Returns True if a table was dropped.
+    """
+    pointer = pointer if pointer is not None else _get_alias_pointer(alias)
+    previous_table = _undropped_retired_table(alias, pointer)
+    if not previous_table or _retired_table_age_seconds(pointer) < TABLE_ALIAS_DROP_GRACE_SECONDS:
+        return False
+    deleteTable(previous_table)
+    log.info(f"Dropped retired table {previous_table} for alias {alias}.")
+    return True
+
+def reset_table_versioned(alias: str, items=None, shards: int = BULK_WRITE_DEFAULT_SHARDS):
+    """
+    Opt-in zero-downtime reset (emptyTable is the plain delete/create): create
+    {alias}-v{n+1} with the live table's keys, indexes, stream, encryption, billing
+    and TTL, optionally bulk load `items` into it, then flip the alias pointer in one
+    conditional write. Needs the table-aliases table.
+
+    The first reset treats the table named `alias` as version 0; it is never dropped.
+    Later retired versions are dropped by the next reset (or drop_retired_table), once
+    the alias cache grace period has passed - a reset inside that window is refused.
+
+    `alias` must be listed in ALIASED_TABLES in every lambda that touches the table.
+    Other containers keep their cached pointer for up to TABLE_ALIAS_CACHE_SECONDS after
+    the flip, and anything they write in that window goes to the retired table and is
+    lost with it - only reset tables whose writers are paused or are the resetting job.
+    """
+    global _alias_table_missing
+    try:
+        if alias not in ALIASED_TABLES:
+            raise Exception(f"{alias} is not in ALIASED_TABLES, so readers would never follow the swap - use emptyTable instead")
+        try:
+            pointer = _get_alias_pointer(alias)
+        except ClientError as err:
+            if err.response['Error']['Code'] == 'ResourceNotFoundException':
+                raise Exception(f"Versioned resets need the {TABLE_ALIASES_TABLE_NAME} table - use emptyTable instead")
+            raise
+
+        if not drop_retired_table(alias, pointer) and _undropped_retired_table(alias, pointer):
+            # Dropping it now could pull it from under containers still reading it
+            raise Exception(
+                f"{pointer['previous_table_name']} was retired {_retired_table_age_seconds(pointer):.0f}s ago - "
+                f"wait {TABLE_ALIAS_DROP_GRACE_SECONDS}s between resets"
+            )
+
+        live_table = pointer.get('table_name', alias)
+        next_version = int(pointer.get('table_version', 0)) + 1
+        new_table = f"{alias}-v{next_version}"
+
+        config = _table_config(live_table)
+        try:
+            table = dynamodb_client.create_table(TableName=new_table, **config)
+        except dynamodb_client.exceptions.ResourceInUseException:
+            raise Exception(f"{new_table} already exists - another reset is running, or a failed one left it behind (deleteTable it to retry)")
+        dynamodb_client.get_waiter('table_exists').wait(TableName=new_table)
+        _copy_time_to_live(live_table, new_table)
+
+        if items is not None:
+            key_names = tuple(key['AttributeName'] for key in config['KeySchema'])
+            bulk_write_items(new_table, items, key_names=key_names, shards=shards)
+
+        # Conditional on the pointer version - two concurrent resets can't both flip
+        update_table_item(TABLE_ALIASES_TABLE_NAME, {
+            'alias': alias,
+            'table_name': new_table,
+            'table_version': next_version,
+            'previous_table_name': live_table,
+            'updated_at': datetime.utcnow().isoformat()
+        }, expected_version=int(pointer.get(LOCK_VERSION_ATTRIBUTE, 0)))
+        _alias_cache.pop(alias, None)
+        _alias_table_missing = False
+        invalidate_item_cache(alias)
+        log.info(f"Table alias {alias} now points at {new_table} (was {live_table}).")
+        return table
+    except Exception as err:
+        log.error(f"Dynamodb Reset Table Versioned: {err}")
+        raise Exception(f"Dynamodb Reset Table Versioned: {err}")
+
 def deleteTable(table_name):
     try:
         return dynamodb_client.delete_table(TableName=table_name)
     except Exception as err:
         log.error(f"Dynamodb Table Delete Table: {err}")
         raise Exception(f"Dynamodb Table Delete Table: {err}")
-def createTable(table_name, hash_key, hash_key_type):
+def createTable(table_name, hash_key, hash_key_type, range_key=None, range_key_type='S', local_indexes=None):
+    """
+    Create a KMS encrypted, on-demand table and wait for it to exist.
+    local_indexes: optional [(index_name, range_attr, range_attr_type)] sharing the hash key.
+    """
     try:
         #Wait for table to be deleted
         waiter = dynamodb_client.get_waiter('table_not_exists')
@@ -211,21 +1022,41 @@ def createTable(table_name, hash_key, hash_key_type):
         kms_key = kms_res.describe_key(
             KeyId=DYNAMODB_KMS_ALIAS
         )
+        key_schema = [
+            {
+                'AttributeName': hash_key,
+                'KeyType': 'HASH'
+            }
+        ]
+        attribute_definitions = [
+            {
+                'AttributeName': hash_key,
+                'AttributeType': hash_key_type
+            }
+        ]
+        if range_key:
+            key_schema.append({'AttributeName': range_key, 'KeyType': 'RANGE'})
+            attribute_definitions.append({'AttributeName': range_key, 'AttributeType': range_key_type})
+
+        extra_args = {}
+        if local_indexes:
+            extra_args['LocalSecondaryIndexes'] = []
+            for index_name, index_range_key, index_range_key_type in local_indexes:
+                extra_args['LocalSecondaryIndexes'].append({
+                    'IndexName': index_name,
+                    'KeySchema': [
+                        {'AttributeName': hash_key, 'KeyType': 'HASH'},
+                        {'AttributeName': index_range_key, 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'KEYS_ONLY'}
+                })
+                attribute_definitions.append({'AttributeName': index_range_key, 'AttributeType': index_range_key_type})
+
         #Create table
         table = dynamodb_client.create_table(
             TableName=table_name,
-            KeySchema=[
-                {
-                    'AttributeName': hash_key,
-                    'KeyType': 'HASH'
-                }
-            ],
-            AttributeDefinitions= [
-                {
-                    'AttributeName': hash_key,
-                    'AttributeType': hash_key_type
-                }
-            ],
+            KeySchema=key_schema,
+            AttributeDefinitions=attribute_definitions,
             StreamSpecification={
                 'StreamEnabled': True,
                 'StreamViewType': 'NEW_AND_OLD_IMAGES'
@@ -235,7 +1066,8 @@ def createTable(table_name, hash_key, hash_key_type):
                 'SSEType': 'KMS',
                 'KMSMasterKeyId': kms_key['KeyMetadata']['Arn']
             },
-            BillingMode='PAY_PER_REQUEST'
+            BillingMode='PAY_PER_REQUEST',
+            **extra_args
         )
 
         #Wait for table to exist
@@ -248,21 +1080,498 @@ def createTable(table_name, hash_key, hash_key_type):
         raise Exception(f"Dynamodb Table Create Table: {err}")
     
 
-def batch_write_table_items(table_name: str, db_items: dict):
+def batch_write_table_items(table_name: str, db_items: dict, compress: bool = False):
     try:
-        table = dynamodb_res.Table(table_name)
-        with table.batch_writer() as batch:
-            for player_id, player_data in db_items.items():
-                batch.put_item(
-                    Item={
-                        'player_id': player_id,
-                        'data': player_data,
-                        'last_updated': datetime.utcnow().isoformat()
-                    }
-                )
+        last_updated = datetime.utcnow().isoformat()
+        items = (
+            {
+                'player_id': player_id,
+                'data': player_data,
+                'last_updated': last_updated
+            }
+            for player_id, player_data in db_items.items()
+        )
+        bulk_write_items(table_name, items, key_names=('player_id',), compress=compress)
         log.info(f"Updated {len(db_items)} Items in DynamoDB Table {table_name}.")
         return f"Updated {len(db_items)} Items in DynamoDB Table {table_name}."
     except Exception as err:
         log.error(f"Batch Write Table Items: {err}")
         raise Exception(f"Batch Write Table Items: {err}")
-    
+
+
+# Bulk Writer - any iterable/generator of items, sharded across writer threads.
+# Items are routed to a shard by key hash so repeated keys stay in order on one shard,
+# and each 25-item batch is deduped by key (last write wins).
+def _write_batch(table_name: str, write_requests: list, stats: dict):
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        response = dynamodb_client.batch_write_item(
+            RequestItems={table_name: write_requests},
+            ReturnConsumedCapacity='TOTAL'
+        )
+        for consumed in response.get('ConsumedCapacity', []):
+            stats['consumedCapacity'] += consumed.get('CapacityUnits', 0)
+        write_requests = response.get('UnprocessedItems', {}).get(table_name, [])
+        if not write_requests:
+            stats['batches'] += 1
+            return
+        stats['retries'] += 1
+        if attempt < BATCH_MAX_RETRIES:
+            _batch_backoff(attempt)
+    raise Exception(f"{len(write_requests)} items still unprocessed after {BATCH_MAX_RETRIES} retries")
+
+def bulk_write_items(table_name: str, items, key_names: tuple = None, shards: int = BULK_WRITE_DEFAULT_SHARDS, compress: bool = False, serialized: bool = False) -> dict:
+    """
+    Write items with N concurrent BatchWriteItem shards, retrying UnprocessedItems.
+
+    Args:
+        table_name: Table to write to
+        items: Any iterable/generator of full items - consumed lazily, memory stays bounded
+        key_names: Key attribute names (read from the table's key schema if None)
+        shards: Number of concurrent writer threads
+        compress: Store large map/list attributes as compressed binary
+        serialized: Items are already in low-level wire format ({'S': ...}) - written as-is
+
+    Returns:
+        Dict of items/duplicates/batches/retries, consumed WCU and items per second
+    """
+    try:
+        physical_table = resolve_table_name(table_name)
+        key_names = tuple(key_names or [key['AttributeName'] for key in dynamodb_res.Table(physical_table).key_schema])
+        shards = max(1, min(int(shards), BATCH_MAX_WORKERS))
+        queues = [queue.Queue(maxsize=BULK_WRITE_QUEUE_DEPTH) for _ in range(shards)]
+        pending = [OrderedDict() for _ in range(shards)]
+        shard_stats = [{'batches': 0, 'retries': 0, 'consumedCapacity': 0.0} for _ in range(shards)]
+        errors = []
+        written = duplicates = 0
+
+        def writer(shard):
+            while True:
+                write_requests = queues[shard].get()
+                if write_requests is None:
+                    return
+                if errors:
+                    continue  # keep draining so the producer never blocks
+                try:
+                    _write_batch(physical_table, write_requests, shard_stats[shard])
+                except Exception as err:
+                    errors.append(err)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=shards) as executor:
+            for shard in range(shards):
+                executor.submit(writer, shard)
+            try:
+                for item in items:
+                    if errors:
+                        break
+                    # Wire-format key values are single-entry dicts - key on their (type, value) pair
+                    key = tuple(next(iter(item[name].items())) if serialized else item[name] for name in key_names)
+                    shard = hash(key) % shards
+                    batch = pending[shard]
+                    if key in batch:
+                        duplicates += 1
+                    else:
+                        written += 1
+                    if compress and not serialized:
+                        item = encode_item_attributes(item)
+                    batch[key] = {'PutRequest': {'Item': item if serialized else _serialize_item(item)}}
+                    if len(batch) == BATCH_WRITE_MAX_ITEMS:
+                        queues[shard].put(list(batch.values()))
+                        pending[shard] = OrderedDict()
+                for shard, batch in enumerate(pending):
+                    if batch and not errors:
+                        queues[shard].put(list(batch.values()))
+            finally:
+                for shard_queue in queues:
+                    shard_queue.put(None)
+
+        if errors:
+            raise errors[0]
+
+        invalidate_item_cache(table_name)
+        elapsed = time.perf_counter() - started
+        stats = {
+            'items': written,
+            'duplicates': duplicates,
+            'batches': sum(stats['batches'] for stats in shard_stats),
+            'retries': sum(stats['retries'] for stats in shard_stats),
+            'consumedWCU': sum(stats['consumedCapacity'] for stats in shard_stats),
+            'seconds': round(elapsed, 3),
+            'itemsPerSecond': round(written / elapsed) if elapsed else 0,
+            'shards': shards
+        }
+        log.info(
+            f"Bulk wrote {written} items to {table_name} in {stats['seconds']}s "
+            f"({stats['itemsPerSecond']} items/s, {stats['consumedWCU']} WCU, {stats['retries']} retries, "
+            f"{duplicates} duplicate keys) across {shards} shards."
+        )
+        return stats
+    except Exception as err:
+        log.error(f"Dynamodb Bulk Write Items: {err}")
+        raise Exception(f"Dynamodb Bulk Write Items: {err}")
+
+
+# Export / Import - gzip-compressed JSON Lines in DynamoDB JSON, one {"Item": {...}} per line
+# with B/BS values base64-encoded (the same shape as DynamoDB's S3 export). Items stay in
+# wire format end to end, and both directions stream page by page through bounded queues,
+# so memory stays flat regardless of table size.
+EXPORT_QUEUE_DEPTH = 8
+
+def _wire_to_json(value: dict) -> dict:
+    (value_type, raw), = value.items()
+    if value_type == 'B':
+        return {'B': base64.b64encode(raw).decode('ascii')}
+    if value_type == 'BS':
+        return {'BS': [base64.b64encode(b).decode('ascii') for b in raw]}
+    if value_type == 'M':
+        return {'M': {k: _wire_to_json(v) for k, v in raw.items()}}
+    if value_type == 'L':
+        return {'L': [_wire_to_json(v) for v in raw]}
+    return value
+
+def _json_to_wire(value: dict) -> dict:
+    (value_type, raw), = value.items()
+    if value_type == 'B':
+        return {'B': base64.b64decode(raw)}
+    if value_type == 'BS':
+        return {'BS': [base64.b64decode(b) for b in raw]}
+    if value_type == 'M':
+        return {'M': {k: _json_to_wire(v) for k, v in raw.items()}}
+    if value_type == 'L':
+        return {'L': [_json_to_wire(v) for v in raw]}
+    return value
+
+def iter_export_file(path: str):
+    """Yield wire-format items from an export file one line at a time."""
+    with gzip.open(path, 'rt', encoding='utf-8') as export_file:
+        for line in export_file:
+            if line.strip():
+                yield {k: _json_to_wire(v) for k, v in json.loads(line)['Item'].items()}
+
+def export_table(table_name: str, path: str, total_segments: int = 4) -> dict:
+    """
+    Stream a table to a gzip JSON Lines file using parallel scan segments.
+
+    Segment threads hand pages to this thread through a bounded queue, so at most
+    EXPORT_QUEUE_DEPTH pages are held in memory at once.
+
+    Returns:
+        Dict of items/pages/consumed RCU/bytes written/seconds
+    """
+    try:
+        total_segments = max(1, min(int(total_segments), MAX_SCAN_SEGMENTS))
+        physical_table = resolve_table_name(table_name)
+        pages = queue.Queue(maxsize=EXPORT_QUEUE_DEPTH)
+        stop = threading.Event()
+
+        def on_page(segment, items):
+            if stop.is_set():
+                raise Exception("Export aborted")
+            pages.put(items)
+
+        def run_segment(segment):
+            try:
+                return _scan_segment(physical_table, segment, total_segments, on_page, raw=True)
+            finally:
+                pages.put(None)
+
+        started = time.perf_counter()
+        exported = 0
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            futures = [executor.submit(run_segment, seg) for seg in range(total_segments)]
+            try:
+                with gzip.open(path, 'wt', encoding='utf-8') as export_file:
+                    remaining = total_segments
+                    while remaining:
+                        items = pages.get()
+                        if items is None:
+                            remaining -= 1
+                            continue
+                        for item in items:
+                            export_file.write(json.dumps({'Item': {k: _wire_to_json(v) for k, v in item.items()}}, separators=(',', ':')))
+                            export_file.write('\n')
+                        exported += len(items)
+            except Exception:
+                stop.set()
+                # Unblock segment threads waiting on a full queue so the pool can shut down
+                while any(not future.done() for future in futures):
+                    try:
+                        pages.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                raise
+            segment_stats = [future.result() for future in futures]
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            'items': exported,
+            'pages': sum(stats['pages'] for stats in segment_stats),
+            'consumedRCU': sum(stats['consumedCapacity'] for stats in segment_stats),
+            'bytes': os.path.getsize(path),
+            'seconds': round(elapsed, 3),
+            'segments': total_segments
+        }
+        log.info(
+            f"Exported {exported} items from {table_name} to {path} in {stats['seconds']}s "
+            f"({stats['bytes']} bytes, {stats['consumedRCU']} RCU) across {total_segments} segments."
+        )
+        return stats
+    except Exception as err:
+        log.error(f"Dynamodb Export Table: {err}")
+        raise Exception(f"Dynamodb Export Table: {err}")
+
+def import_table(table_name: str, path: str, shards: int = BULK_WRITE_DEFAULT_SHARDS) -> dict:
+    """Stream an export_table file into a table through the sharded bulk writer. Returns the bulk writer stats."""
+    try:
+        stats = bulk_write_items(table_name, iter_export_file(path), shards=shards, serialized=True)
+        log.info(f"Imported {stats['items']} items from {path} into {table_name}.")
+        return stats
+    except Exception as err:
+        log.error(f"Dynamodb Import Table: {err}")
+        raise Exception(f"Dynamodb Import Table: {err}")
+
+
+# Incremental Sync - hash each item's data and only write what actually changed
+SYNC_HASH_ATTRIBUTE = 'data_hash'
+# An empty/truncated source would otherwise delete most of the table - refuse unless forced
+SYNC_MAX_REMOVED_FRACTION = 0.1
+
+def hash_item_data(item_data, ignore_fields: tuple = ()) -> str:
+    if isinstance(item_data, dict) and ignore_fields:
+        item_data = {k: v for k, v in item_data.items() if k not in ignore_fields}
+    payload = json.dumps(item_data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def get_stored_item_hashes(table_name: str, primary_key: str = 'player_id') -> dict:
+    try:
+        # Only pull the key + hash, not the full data map
+        items = iter_scan(
+            table_name,
+            ProjectionExpression='#pk, #hash',
+            ExpressionAttributeNames={'#pk': primary_key, '#hash': SYNC_HASH_ATTRIBUTE}
+        )
+        return {item[primary_key]: item.get(SYNC_HASH_ATTRIBUTE) for item in items}
+    except Exception as err:
+        log.error(f"Dynamodb Get Stored Item Hashes: {err}")
+        raise Exception(f"Dynamodb Get Stored Item Hashes: {err}")
+
+def sync_table_items(table_name: str, db_items: dict, primary_key: str = 'player_id', ignore_fields: tuple = (), delete_missing: bool = True, compress: bool = False, force: bool = False) -> dict:
+    """
+    Incrementally sync {id: data} into the table, same item shape as batch_write_table_items.
+
+    Items whose data hash matches the stored hash are skipped, new/changed items are
+    written and (if delete_missing) items no longer in db_items are deleted.
+    Items written before hashing existed have no hash and are rewritten once.
+
+    With delete_missing, an empty db_items or one that would remove more than
+    SYNC_MAX_REMOVED_FRACTION of the stored items is refused before anything is
+    written (the source was probably truncated) - pass force=True to sync anyway.
+
+    Returns:
+        Dict of unchanged/changed/added/removed counts
+    """
+    try:
+        stored_hashes = get_stored_item_hashes(table_name, primary_key)
+        if delete_missing and stored_hashes and not force:
+            removing = sum(1 for item_id in stored_hashes if item_id not in db_items)
+            if not db_items or removing > len(stored_hashes) * SYNC_MAX_REMOVED_FRACTION:
+                raise Exception(
+                    f"Refusing to remove {removing} of {len(stored_hashes)} items from {table_name} "
+                    f"(max {SYNC_MAX_REMOVED_FRACTION:.0%}) - pass force=True if the source really shrank"
+                )
+        counts = {'unchanged': 0, 'changed': 0, 'added': 0, 'removed': 0}
+        last_updated = datetime.utcnow().isoformat()
+
+        table = _table(table_name)
+        with table.batch_writer() as batch:
+            for item_id, item_data in db_items.items():
+                data_hash = hash_item_data(item_data, ignore_fields)
+                is_new = item_id not in stored_hashes
+                stored_hash = stored_hashes.pop(item_id, None)
+
+                if stored_hash == data_hash:
+                    counts['unchanged'] += 1
+                    continue
+
+                counts['added' if is_new else 'changed'] += 1
+                item = {
+                    primary_key: item_id,
+                    'data': item_data,
+                    SYNC_HASH_ATTRIBUTE: data_hash,
+                    'last_updated': last_updated
+                }
+                batch.put_item(Item=encode_item_attributes(item) if compress else item)
+
+            # Whatever is left in stored_hashes wasn't in the source - retired
+            if delete_missing:
+                for item_id in stored_hashes:
+                    batch.delete_item(Key={primary_key: item_id})
+                    counts['removed'] += 1
+
+        invalidate_item_cache(table_name)
+        log.info(
+            f"Synced DynamoDB Table {table_name}: {counts['unchanged']} unchanged, {counts['changed']} changed, "
+            f"{counts['added']} added, {counts['removed']} removed."
+        )
+        return counts
+    except Exception as err:
+        log.error(f"Sync Table Items: {err}")
+        raise Exception(f"Sync Table Items: {err}")
+
+
+# Rank Index - one row per (goal_filter, item_id) in a companion table, maintained on
+# write, with a local secondary index on rank so "top N for goal X" is one ordered query.
+# The item write and its rank row changes go in one TransactWriteItems, guarded by the
+# item's lock version, so the index can't drift from the items - as long as ranked
+# tables are only written through update_ranked_item / delete_ranked_item.
+# update_table_item, update_table_item_field, delete_table_item, bulk_write_items and
+# sync_table_items don't touch rank rows or bump the lock version, so using them on a
+# ranked table leaves stale or orphaned rank rows the transaction guard can't see.
+RANK_INDEX_TABLE_SUFFIX = '-ranks'
+RANK_INDEX_NAME = 'rank-index'
+RANK_INDEX_MAX_RETRIES = 3
+TRANSACT_MAX_ITEMS = 100
+
+def get_rank_index_table_name(table_name: str) -> str:
+    return f"{table_name}{RANK_INDEX_TABLE_SUFFIX}"
+
+def _hash_key_type(table_name: str) -> str:
+    table = dynamodb_client.describe_table(TableName=resolve_table_name(table_name))['Table']
+    hash_key = next(key['AttributeName'] for key in table['KeySchema'] if key['KeyType'] == 'HASH')
+    return next(attr['AttributeType'] for attr in table['AttributeDefinitions'] if attr['AttributeName'] == hash_key)
+
+def create_rank_index_table(table_name: str):
+    """Create the rank index for an existing table - item_id takes the table's hash key type."""
+    return createTable(
+        get_rank_index_table_name(table_name),
+        'goal_filter', 'S',
+        range_key='item_id', range_key_type=_hash_key_type(table_name),
+        local_indexes=[(RANK_INDEX_NAME, 'rank', 'N')]
+    )
+
+def _rank_row_actions(rank_table_name: str, item_id, rank_dict: dict, old_rank_dict: dict) -> list:
+    actions = []
+    for goal_filter, rank in (rank_dict or {}).items():
+        if (old_rank_dict or {}).get(goal_filter) != rank:
+            row = {'goal_filter': goal_filter, 'item_id': item_id, 'rank': rank}
+            actions.append({'Put': {'TableName': rank_table_name, 'Item': _serialize_item(row)}})
+    for goal_filter in set(old_rank_dict or {}) - set(rank_dict or {}):
+        key = {'goal_filter': goal_filter, 'item_id': item_id}
+        actions.append({'Delete': {'TableName': rank_table_name, 'Key': _serialize_item(key)}})
+    return actions
+
+def _version_condition_expression(expected_version: int) -> dict:
+    # _version_condition for low-level client calls, which need string expressions
+    expression = '#version = :version'
+    if expected_version == 0:
+        expression += ' OR attribute_not_exists(#version)'
+    return {
+        'ConditionExpression': expression,
+        'ExpressionAttributeNames': {'#version': LOCK_VERSION_ATTRIBUTE},
+        'ExpressionAttributeValues': {':version': {'N': str(expected_version)}}
+    }
+
+def _is_transaction_conflict(err) -> bool:
+    return isinstance(err, ClientError) and err.response['Error']['Code'] in ('TransactionCanceledException', 'TransactionConflictException')
+
+def _transact_ranked_write(table_name: str, primary_key: str, primary_key_value, table_item: dict = None) -> dict:
+    """
+    Put table_item (or delete the item when None) and apply the rank row changes in one
+    transaction. The old rank_dict is read first; the write is conditioned on the lock
+    version seen, so a concurrent writer makes us re-read and retry. Returns the old item.
+    """
+    physical_name = resolve_table_name(table_name)
+    rank_table_name = resolve_table_name(get_rank_index_table_name(table_name))
+    key = _serialize_item({primary_key: primary_key_value})
+
+    for attempt in range(RANK_INDEX_MAX_RETRIES + 1):
+        wire_item = dynamodb_client.get_item(TableName=physical_name, Key=key, ConsistentRead=True).get('Item')
+        old_item = _deserialize_item(wire_item) if wire_item else {}
+        if table_item is None and not old_item:
+            return {}
+        version = int(old_item.get(LOCK_VERSION_ATTRIBUTE, 0))
+        condition = _version_condition_expression(version)
+
+        if table_item is None:
+            item_action = {'Delete': {'TableName': physical_name, 'Key': key, **condition}}
+        else:
+            item_action = {'Put': {'TableName': physical_name, 'Item': _serialize_item({**table_item, LOCK_VERSION_ATTRIBUTE: version + 1}), **condition}}
+        actions = [item_action] + _rank_row_actions(
+            rank_table_name, primary_key_value, (table_item or {}).get('rank_dict'), old_item.get('rank_dict')
+        )
+        if len(actions) > TRANSACT_MAX_ITEMS:
+            raise Exception(f"{len(actions) - 1} rank changes for ({primary_key_value}) exceed one transaction ({TRANSACT_MAX_ITEMS - 1} max)")
+
+        try:
+            dynamodb_client.transact_write_items(TransactItems=actions)
+            invalidate_item_cache(table_name, {primary_key: primary_key_value})
+            return old_item
+        except ClientError as err:
+            if not _is_transaction_conflict(err):
+                raise
+            if attempt == RANK_INDEX_MAX_RETRIES:
+                raise ConflictError(
+                    f"Item ({primary_key_value}) kept changing while updating its ranks",
+                    HANDLER, '_transact_ranked_write', resource=table_name
+                )
+            _batch_backoff(attempt)
+
+def update_ranked_item(table_name: str, primary_key: str, table_item: dict):
+    """Put a full item with a rank_dict and its rank index rows atomically. Returns {'Attributes': old item}."""
+    try:
+        return {'Attributes': _transact_ranked_write(table_name, primary_key, table_item[primary_key], table_item)}
+    except ConflictError:
+        raise
+    except Exception as err:
+        log.error(f"Dynamodb Update Ranked Item: {err}")
+        raise Exception(f"Dynamodb Update Ranked Item: {err}")
+
+def delete_ranked_item(table_name: str, primary_key: str, primary_key_value):
+    """Delete an item and its rank index rows atomically. Returns {'Attributes': old item}."""
+    try:
+        return {'Attributes': _transact_ranked_write(table_name, primary_key, primary_key_value)}
+    except ConflictError:
+        raise
+    except Exception as err:
+        log.error(f"Dynamodb Delete Ranked Item: {err}")
+        raise Exception(f"Dynamodb Delete Ranked Item: {err}")
+
+def query_top_ranked(table_name: str, goal_filter: str, limit: int = None, primary_key: str = None, ascending: bool = True) -> list:
+    """
+    Top `limit` (default all) items for a goal, ordered by rank straight from the index.
+    For a known set of ids use get_ranks_by_ids - it reads only those rows.
+    Returns [{'item_id', 'rank'}] or, if primary_key is given, the full items with 'rank' set.
+    """
+    try:
+        query_kwargs = {'IndexName': RANK_INDEX_NAME}
+        if limit:
+            query_kwargs['Limit'] = limit
+        rows = list(iter_query(
+            get_rank_index_table_name(table_name),
+            'goal_filter', goal_filter,
+            ascending=ascending,
+            max_items=limit,
+            **query_kwargs
+        ))
+        if not primary_key:
+            return [{'item_id': row['item_id'], 'rank': row['rank']} for row in rows]
+
+        items = {item[primary_key]: item for item in batch_get_items({table_name: (primary_key, [row['item_id'] for row in rows])})[table_name]}
+        ranked = []
+        for row in rows:
+            if row['item_id'] in items:
+                ranked.append({**items[row['item_id']], 'rank': row['rank']})
+        return ranked
+    except Exception as err:
+        log.error(f"Dynamodb Query Top Ranked: {err}")
+        raise Exception(f"Dynamodb Query Top Ranked: {err}")
+
+def get_ranks_by_ids(table_name: str, goal_filter: str, ids: list) -> dict:
+    """Rank of each id for a goal from the rank index - {item_id: rank}, unranked ids are skipped."""
+    try:
+        keys = [{'goal_filter': goal_filter, 'item_id': item_id} for item_id in ids]
+        rows = batch_get_items({get_rank_index_table_name(table_name): (None, keys)})[get_rank_index_table_name(table_name)]
+        return {row['item_id']: row['rank'] for row in rows}
+    except Exception as err:
+        log.error(f"Dynamodb Get Ranks By Ids: {err}")
+        raise Exception(f"Dynamodb Get Ranks By Ids: {err}")
@@ -5,26 +5,22 @@ HTML email templates for fantasy football notifications.
 Table-based layouts with inline CSS for email client compatibility.
 """
 
-from .taxi_steal_league import (
-    generate_taxi_steal_league_email,
-    generate_taxi_steal_league_email_plain_text,
-)
-from .taxi_steal_owner import (
-    generate_taxi_steal_owner_email,
-    generate_taxi_steal_owner_email_plain_text,
-)
-from .rule_proposed import (
-    generate_rule_proposed_email,
-    generate_rule_proposed_email_plain_text,
-)
-from .rule_accepted import (
-    generate_rule_accepted_email,
-    generate_rule_accepted_email_plain_text,
-)
-from .rule_denied import (
-    generate_rule_denied_email,
-    generate_rule_denied_email_plain_text,
-)
+import importlib
+
+# Template function -> submodule. Submodules are imported on first access (PEP 562),
+# so a handler only loads the templates it actually renders.
+_TEMPLATE_MODULES = {
+    "generate_taxi_steal_league_email": "taxi_steal_league",
+    "generate_taxi_steal_league_email_plain_text": "taxi_steal_league",
+    "generate_taxi_steal_owner_email": "taxi_steal_owner",
+    "generate_taxi_steal_owner_email_plain_text": "taxi_steal_owner",
+    "generate_rule_proposed_email": "rule_proposed",
+    "generate_rule_proposed_email_plain_text": "rule_proposed",
+    "generate_rule_accepted_email": "rule_accepted",
+    "generate_rule_accepted_email_plain_text": "rule_accepted",
+    "generate_rule_denied_email": "rule_denied",
+    "generate_rule_denied_email_plain_text": "rule_denied",
+}
 
 __all__ = [
     "generate_taxi_steal_league_email",
@@ -38,3 +34,16 @@ __all__ = [
     "generate_rule_denied_email",
     "generate_rule_denied_email_plain_text",
 ]
+
+
+def __getattr__(name):
+    module_name = _TEMPLATE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -14,6 +14,10 @@ import json
 import traceback
 from typing import Optional
 from lambdas.common.logger import get_logger
+from lambdas.common.metrics import begin_invocation, emit_invocation_metrics
+from lambdas.common.prewarm import PREWARM_REGISTRY, start_prewarm
+from lambdas.common.utility_helpers import is_warm_ping
+from lambdas.common.warmer import handle_warm_ping, record_invocation
 
 log = get_logger(__file__)
 
@@ -124,6 +128,20 @@ class NotFoundError(XomperError):
         )
 
 
+class ConflictError(XomperError):
+    """Raised when a write loses an optimistic-locking race or repeats an action."""
+    
+    def __init__(self, message: str, handler: str = "unknown", function: str = "unknown", resource: str = None):
+        details = {"resource": resource} if resource else {}
+        super().__init__(
+            message=message,
+            handler=handler,
+            function=function,
+            status=409,
+            details=details
+        )
+
+
 class DynamoDBError(XomperError):
     """Raised when DynamoDB operations fail."""
     
@@ -256,13 +274,18 @@ def log_error_context(handler_name: str, function_name: str, event: dict, contex
 # Error Handler Decorator
 # ============================================
 
-def handle_errors(handler_name: str, log_context: bool = True):
+def handle_errors(handler_name: str, log_context: bool = True, warm_pings: bool = True):
     """
     Decorator to handle errors consistently across handlers.
+    Also emits the invocation's DynamoDB metrics record (see lambdas.common.metrics) once the handler returns.
+    Decorating happens at the end of init, so this is also where registered prewarms run (see lambdas.common.prewarm);
+    the first request logs which of them had finished.
 
     Args:
         handler_name: Name of the handler for logging
         log_context: If True, logs event/context details on error (with sensitive data masked)
+        warm_pings: If True, keep-warm pings (see lambdas.common.warmer) are answered before the handler runs.
+                    Turn off for handlers that are genuinely driven by scheduled events.
 
     Usage:
         @handle_errors("email")
@@ -275,7 +298,14 @@ def handle_errors(handler_name: str, log_context: bool = True):
             ...
     """
     def decorator(func):
+        start_prewarm()
+
         def wrapper(event, context):
+            if warm_pings and is_warm_ping(event):
+                return handle_warm_ping(event, context, handler_name)
+            record_invocation()
+            PREWARM_REGISTRY.report_first_request()
+            begin_invocation(handler_name, func.__name__, context)
             try:
                 return func(event, context)
             except XomperError as e:
@@ -300,6 +330,8 @@ def handle_errors(handler_name: str, log_context: bool = True):
                     status=500
                 )
                 return error.to_response()
+            finally:
+                emit_invocation_metrics()
         return wrapper
     return decorator
 
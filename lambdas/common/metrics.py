@@ -0,0 +1,170 @@
+"""
+Xomper Invocation Metrics
+=========================
+Per-invocation DynamoDB cost and latency accounting.
+
+Every DynamoDB client call made through dynamo_helpers is recorded here
+(see dynamo_helpers.instrument_dynamodb_client) and aggregated per table and
+operation. handle_errors resets the collector when an invocation starts and
+emits one structured record when it ends.
+
+Record shape:
+    {
+        "metric": "dynamodb",
+        "handler": "email_taxi",
+        "function": "handler",
+        "requestId": "...",
+        "durationMs": 412.7,
+        "totals": {"calls": 5, "pages": 7, "items": 31, "rcu": 4.5, "wcu": 2.0, "ms": 96.4, "errors": 0},
+        "tables": {"xomper-players": {"Query": {...}, "GetItem": {...}}}
+    }
+
+Work that can outlive the invocation (e.g. stale-while-revalidate refreshes) runs
+through run_in_background: its calls are kept out of every invocation window and
+emitted as their own record, tagged with the invocation that started it and
+"background": true.
+"""
+
+import json
+import threading
+import time
+from typing import Optional
+
+from lambdas.common.logger import get_logger
+
+log = get_logger(__file__)
+
+METRIC_NAME = 'dynamodb'
+
+READ_OPERATIONS = {'GetItem', 'BatchGetItem', 'Query', 'Scan', 'TransactGetItems'}
+WRITE_OPERATIONS = {'PutItem', 'UpdateItem', 'DeleteItem', 'BatchWriteItem', 'TransactWriteItems'}
+# Operations that accept ReturnConsumedCapacity
+CAPACITY_OPERATIONS = READ_OPERATIONS | WRITE_OPERATIONS
+
+
+def _empty_stats() -> dict:
+    # pages == requests sent; calls == operations, so a Scan/Query that followed
+    # LastEvaluatedKey across 3 pages is 1 call and 3 pages
+    return {'calls': 0, 'pages': 0, 'items': 0, 'rcu': 0.0, 'wcu': 0.0, 'ms': 0.0, 'errors': 0}
+
+
+class InvocationMetrics:
+    """
+    Thread-safe aggregator - parallel scans and bulk writers record from worker threads.
+    One instance per container, reset at the start of each invocation.
+    """
+
+    def __init__(self, background: bool = False):
+        self._lock = threading.Lock()
+        self.background = background
+        self.reset()
+
+    def reset(self, handler: str = None, function: str = None, request_id: str = None):
+        with self._lock:
+            self.handler = handler
+            self.function = function
+            self.request_id = request_id
+            self.started = time.perf_counter()
+            self.tables = {}
+
+    def record_call(self, table_name: str, operation: str, ms: float = 0.0, items: int = 0, error: bool = False, continuation: bool = False):
+        """continuation: the request resumed a Scan/Query (ExclusiveStartKey) - a new page, not a new call."""
+        with self._lock:
+            stats = self.tables.setdefault(table_name, {}).setdefault(operation, _empty_stats())
+            stats['calls'] += 0 if continuation else 1
+            stats['pages'] += 1
+            stats['items'] += items
+            stats['ms'] += ms
+            stats['errors'] += int(error)
+
+    def record_capacity(self, table_name: str, operation: str, capacity_units: float):
+        kind = 'wcu' if operation in WRITE_OPERATIONS else 'rcu'
+        with self._lock:
+            stats = self.tables.setdefault(table_name, {}).setdefault(operation, _empty_stats())
+            stats[kind] += capacity_units
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tables = {
+                table: {operation: {**stats, 'ms': round(stats['ms'], 1)} for operation, stats in operations.items()}
+                for table, operations in self.tables.items()
+            }
+            totals = _empty_stats()
+            for operations in tables.values():
+                for stats in operations.values():
+                    for field in totals:
+                        totals[field] += stats[field]
+            totals['ms'] = round(totals['ms'], 1)
+            record = {
+                'metric': METRIC_NAME,
+                'handler': self.handler,
+                'function': self.function,
+                'requestId': self.request_id,
+                'durationMs': round((time.perf_counter() - self.started) * 1000, 1),
+                'totals': totals,
+                'tables': tables,
+            }
+            if self.background:
+                record['background'] = True
+            return record
+
+
+INVOCATION_METRICS = InvocationMetrics()
+_thread_state = threading.local()
+
+
+def current_metrics() -> InvocationMetrics:
+    """Collector for calls made on this thread - a background task's own, else the invocation's."""
+    return getattr(_thread_state, 'collector', None) or INVOCATION_METRICS
+
+
+def run_in_background(target, name: str = None) -> threading.Thread:
+    """
+    Run target on a daemon thread with its DynamoDB calls collected apart from the
+    invocation windows (it may still be running when the next invocation starts).
+    They're emitted as one record, tagged with the invocation that started the work.
+    """
+    collector = InvocationMetrics(background=True)
+    collector.reset(INVOCATION_METRICS.handler, INVOCATION_METRICS.function, INVOCATION_METRICS.request_id)
+
+    def _run():
+        _thread_state.collector = collector
+        try:
+            target()
+        finally:
+            _thread_state.collector = None
+            _emit(collector)
+
+    thread = threading.Thread(target=_run, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def begin_invocation(handler: str, function: str = None, context=None):
+    """Start a fresh aggregation window - called by handle_errors before the handler runs."""
+    INVOCATION_METRICS.reset(handler, function, getattr(context, 'aws_request_id', None))
+
+
+def get_invocation_metrics() -> dict:
+    """Current aggregated figures for this invocation."""
+    return INVOCATION_METRICS.snapshot()
+
+
+def emit_invocation_metrics() -> Optional[dict]:
+    """
+    Log the invocation's figures as one JSON record (skipped if DynamoDB wasn't touched).
+    Never raises - metrics must not break a response.
+    """
+    return _emit(INVOCATION_METRICS)
+
+
+def _emit(collector: InvocationMetrics) -> Optional[dict]:
+    try:
+        record = collector.snapshot()
+        if not record['tables']:
+            return None
+        log.info(json.dumps(record, separators=(',', ':')))
+        return record
+    except Exception as err:
+        log.warning(f"Failed to emit invocation metrics: {err}")
+        return None
@@ -0,0 +1,440 @@
+"""
+Xomper Notifications
+====================
+Registry of notification types and the shared dispatch path used by the
+notification dispatcher and the per-route email handlers.
+
+Each type declares:
+    validator(body) -> payload
+        Check/normalize the request body, resolving ids server-side where
+        supported. Raises ValidationError / NotFoundError.
+    content_builder(payload) -> {audience: (subject, html_body, text_body)}
+        Render once per audience - every recipient in an audience gets the same email.
+    recipient_policy(payload) -> {audience: [emails]}
+        Who receives each audience's email.
+    persist(payload), optional
+        Store whatever the notification announces. Runs after rendering, right
+        before sending, and must be idempotent so a retried request still sends.
+        Validators never write.
+    digest
+        Whether a batch may collapse identical emails from several events of this
+        type into one send per recipient.
+
+Usage:
+    from lambdas.common.notifications import dispatch_notification, dispatch_notification_batch
+
+    result = dispatch_notification('rule_accept', body)
+    results = dispatch_notification_batch([{"type": "rule_accept", ...}, {"type": "taxi_steal", ...}])
+"""
+
+import asyncio
+import json
+from typing import Callable
+
+from lambdas.common import email_templates
+from lambdas.common.constants import (
+    XOMPER_URL,
+    PLAYERS_TABLE_NAME,
+    USERS_TABLE_NAME,
+    SLEEPER_PLAYER_IMAGE_URL,
+    SLEEPER_TEAM_LOGO_URL,
+)
+from lambdas.common.errors import NotFoundError, ValidationError, XomperError
+from lambdas.common.logger import get_logger
+from lambdas.common.ses_helper import send_emails_concurrently, send_emails_with_results
+from lambdas.common.utility_helpers import require_fields
+
+log = get_logger(__file__)
+
+HANDLER = 'notifications'
+
+MAX_BATCH_NOTIFICATIONS = 50
+
+
+class NotificationType:
+    """A notification type: how to validate it, render it and who gets it."""
+
+    def __init__(self, name: str, validator: Callable, content_builder: Callable, recipient_policy: Callable, digest: bool = False, persist: Callable = None):
+        self.name = name
+        self.validator = validator
+        self.content_builder = content_builder
+        self.recipient_policy = recipient_policy
+        self.digest = digest
+        self.persist = persist
+
+    def build_email_tasks(self, payload: dict, content: dict = None) -> list:
+        """(to_email, subject, html_body, text_body) for every recipient of every audience."""
+        if content is None:
+            content = self.content_builder(payload)
+        recipients = self.recipient_policy(payload)
+        return [
+            (email, *content[audience])
+            for audience, emails in recipients.items()
+            if audience in content
+            for email in emails
+            if email
+        ]
+
+
+NOTIFICATION_TYPES = {}
+
+
+def register_notification_type(notification_type: NotificationType) -> NotificationType:
+    NOTIFICATION_TYPES[notification_type.name] = notification_type
+    return notification_type
+
+
+def get_notification_type(name: str) -> NotificationType:
+    notification_type = NOTIFICATION_TYPES.get(name)
+    if notification_type is None:
+        raise ValidationError(
+            f"Unknown notification type '{name}'. Expected one of: {', '.join(sorted(NOTIFICATION_TYPES))}",
+            HANDLER, 'get_notification_type', field='type'
+        )
+    return notification_type
+
+
+def _require_shapes(body: dict, function: str, objects: tuple = (), lists: tuple = ()):
+    """Raise ValidationError unless each field in objects is a dict, each in lists is a list, and recipients are strings."""
+    for field in objects:
+        if not isinstance(body[field], dict):
+            raise ValidationError(f"{field} must be an object", HANDLER, function, field=field)
+    for field in lists:
+        if not isinstance(body[field], list):
+            raise ValidationError(f"{field} must be a list", HANDLER, function, field=field)
+    if not all(isinstance(email, str) for email in body.get('recipients') or []):
+        raise ValidationError("recipients must be email addresses", HANDLER, function, field='recipients')
+
+
+def dispatch_notification(type_name: str, body: dict) -> dict:
+    """Validate, render and send one notification. Returns the email endpoints' response body."""
+    notification_type = get_notification_type(type_name)
+    payload = notification_type.validator(body)
+    tasks = notification_type.build_email_tasks(payload)
+    if notification_type.persist:
+        notification_type.persist(payload)
+
+    successes, failures = send_emails_concurrently(tasks)
+    log.info(f"{type_name} emails complete: {successes} sent, {failures} failed")
+    return {
+        "successfulEmails": successes,
+        "failedEmails": failures
+    }
+
+
+def _render_key(notification_type: NotificationType, payload: dict) -> str:
+    # Recipient lists don't change what gets rendered
+    content_fields = {key: value for key, value in payload.items() if key != 'recipients'}
+    return f"{notification_type.name}:{json.dumps(content_fields, sort_keys=True, default=str)}"
+
+
+def dispatch_notification_batch(notifications: list) -> dict:
+    """
+    Validate, render and send several notifications through one shared fan-out.
+
+    Events with the same content are rendered once. For digest types, a recipient
+    who is owed the identical email by several events gets it once; the send is
+    credited to the first event and counted as deduplicated on the rest. An event
+    that fails - validation or otherwise - gets its error in its own result and
+    doesn't fail the batch.
+    """
+    if not isinstance(notifications, list) or not notifications:
+        raise ValidationError("notifications must be a non-empty list", HANDLER, 'dispatch_notification_batch', field='notifications')
+    if len(notifications) > MAX_BATCH_NOTIFICATIONS:
+        raise ValidationError(
+            f"A batch takes at most {MAX_BATCH_NOTIFICATIONS} notifications, got {len(notifications)}",
+            HANDLER, 'dispatch_notification_batch', field='notifications'
+        )
+
+    rendered = {}       # render key -> content
+    tasks = []          # unique sends for the shared fan-out
+    digest_tasks = {}   # email task -> position in tasks
+    events = []         # (result, [(task position, owned by this event)])
+
+    for index, body in enumerate(notifications):
+        type_name = body.get('type') if isinstance(body, dict) else None
+        result = {"index": index, "type": type_name}
+        sends = []
+        try:
+            if not isinstance(body, dict):
+                raise ValidationError("Each notification must be an object", HANDLER, 'dispatch_notification_batch', field='notifications')
+            notification_type = get_notification_type(type_name)
+            payload = notification_type.validator(body)
+
+            render_key = _render_key(notification_type, payload)
+            if render_key not in rendered:
+                rendered[render_key] = notification_type.content_builder(payload)
+
+            event_tasks = notification_type.build_email_tasks(payload, rendered[render_key])
+            if notification_type.persist:
+                notification_type.persist(payload)
+
+            for task in event_tasks:
+                if notification_type.digest and task in digest_tasks:
+                    sends.append((digest_tasks[task], False))
+                    continue
+                if notification_type.digest:
+                    digest_tasks[task] = len(tasks)
+                sends.append((len(tasks), True))
+                tasks.append(task)
+            result["status"] = 200
+        except XomperError as err:
+            log.warning(f"Batch notification {index} ({type_name}) rejected: {err.message}")
+            result.update(err.to_dict())
+            result["status"] = err.status
+        except Exception as err:
+            # One broken event mustn't take the rest of the batch down with it
+            log.error(f"Batch notification {index} ({type_name}) failed: {err}")
+            error = XomperError(message=str(err), handler=HANDLER, function='dispatch_notification_batch', status=500)
+            result.update(error.to_dict())
+            result["status"] = error.status
+        events.append((result, sends))
+
+    sent = send_emails_with_results(tasks)
+
+    results = []
+    for result, sends in events:
+        if result["status"] == 200:
+            owned = [sent[position] for position, is_owner in sends if is_owner]
+            result["successfulEmails"] = sum(1 for ok in owned if ok)
+            result["failedEmails"] = len(owned) - result["successfulEmails"]
+            result["deduplicatedEmails"] = len(sends) - len(owned)
+        results.append(result)
+
+    successes = sum(1 for ok in sent if ok)
+    log.info(
+        f"Batch of {len(notifications)} notifications complete: {len(rendered)} rendered, "
+        f"{successes} sent, {len(sent) - successes} failed, "
+        f"{sum(r.get('deduplicatedEmails', 0) for r in results)} deduplicated"
+    )
+    return {
+        "successfulEmails": successes,
+        "failedEmails": len(sent) - successes,
+        "results": results
+    }
+
+
+# ============================================
+# Rule Notifications
+# ============================================
+
+def _proposal_fields(proposal: dict) -> dict:
+    return {
+        "proposer_name": proposal.get('proposed_by_username', 'A league member'),
+        "rule_title": proposal.get('title', 'Untitled Rule'),
+        "rule_description": proposal.get('description', ''),
+        "league_name": proposal.get('league_name', ''),
+    }
+
+
+def _league_recipients(payload: dict) -> dict:
+    return {"league": payload['recipients']}
+
+
+def validate_rule_proposal(body: dict) -> dict:
+    require_fields(body, 'proposal', 'recipients')
+    _require_shapes(body, 'validate_rule_proposal', objects=('proposal',), lists=('recipients',))
+    return body
+
+
+def persist_rule_proposal(payload: dict):
+    # Stored before sending so votes can land as soon as the email does - idempotent for retries
+    if payload.get('proposal_id'):
+        from lambdas.common.rule_helpers import create_rule_proposal  # DynamoDB only loaded for this path
+
+        create_rule_proposal(payload['proposal_id'], payload['proposal'])
+
+
+def build_rule_proposal_content(payload: dict) -> dict:
+    fields = _proposal_fields(payload['proposal'])
+    log.info(f"{fields['proposer_name']} proposing: {fields['rule_title']}. Notifying {len(payload['recipients'])} members.")
+
+    subject = f"New Rule Proposal: {fields['rule_title']}"
+    html_body = email_templates.generate_rule_proposed_email(vote_url=XOMPER_URL, **fields)
+    text_body = email_templates.generate_rule_proposed_email_plain_text(vote_url=XOMPER_URL, **fields)
+    return {"league": (subject, html_body, text_body)}
+
+
+def validate_rule_result(body: dict) -> dict:
+    if 'proposal_id' in body:
+        from lambdas.common.rule_helpers import get_vote_tally  # DynamoDB only loaded for this path
+
+        require_fields(body, 'proposal_id', 'recipients')
+        body = {**get_vote_tally(body['proposal_id']), 'recipients': body['recipients']}
+    require_fields(body, 'proposal', 'approved_by', 'rejected_by', 'recipients')
+    _require_shapes(body, 'validate_rule_result', objects=('proposal',), lists=('approved_by', 'rejected_by', 'recipients'))
+    return body
+
+
+def _rule_result_builder(outcome: str, subject_prefix: str, html_template: str, text_template: str) -> Callable:
+    def build(payload: dict) -> dict:
+        fields = _proposal_fields(payload['proposal'])
+        approved_by = payload['approved_by']
+        rejected_by = payload['rejected_by']
+        log.info(
+            f"Rule '{fields['rule_title']}' {outcome}. {len(approved_by)} yes, {len(rejected_by)} no. "
+            f"Notifying {len(payload['recipients'])} members."
+        )
+
+        template_args = {**fields, "approved_voters": approved_by, "rejected_voters": rejected_by, "league_url": XOMPER_URL}
+        subject = f"{subject_prefix}: {fields['rule_title']}"
+        html_body = getattr(email_templates, html_template)(**template_args)
+        text_body = getattr(email_templates, text_template)(**template_args)
+        return {"league": (subject, html_body, text_body)}
+    return build
+
+
+# ============================================
+# Taxi Squad Notifications
+# ============================================
+
+def resolve_taxi_steal_payload(league_id: str, stealer_user_id: str, owner_user_id: str, player_id: str, pick_cost: str = '') -> dict:
+    """
+    Build the full taxi steal body from ids: names from the cached league bundle,
+    player card data from the players table and emails from the users table.
+    """
+    # Imported here so the plain-body path never loads requests/DynamoDB
+    from lambdas.common.sleeper_helper import get_sleeper_league_bundle
+    from lambdas.common.dynamo_helpers import get_item_by_key, table_scan_by_ids
+
+    bundle = asyncio.run(get_sleeper_league_bundle(league_id))
+    users = {user['user_id']: user for user in bundle['users'] or []}
+
+    for user_id in (stealer_user_id, owner_user_id):
+        if user_id not in users:
+            raise NotFoundError(f"User {user_id} is not in league {league_id}", HANDLER, 'resolve_taxi_steal_payload', resource='user')
+
+    owner_roster = next((r for r in bundle['rosters'] or [] if r.get('owner_id') == owner_user_id), {})
+    if player_id not in (owner_roster.get('taxi') or []):
+        log.warning(f"Player {player_id} is not on {owner_user_id}'s taxi squad in league {league_id}.")
+
+    player_item = get_item_by_key(PLAYERS_TABLE_NAME, 'player_id', player_id, override=True)
+    if not player_item:
+        raise NotFoundError(f"Player {player_id} not found", HANDLER, 'resolve_taxi_steal_payload', resource='player')
+    player = player_item.get('data') or {}
+    team = player.get('team') or ''
+
+    # Owner gets the targeted email, everyone else gets the league-wide one
+    emails = {
+        user['user_id']: user.get('email')
+        for user in table_scan_by_ids(USERS_TABLE_NAME, 'user_id', list(users), None)
+    }
+
+    return {
+        "stealer": {"display_name": users[stealer_user_id].get('display_name')},
+        "player": {
+            "first_name": player.get('first_name', ''),
+            "last_name": player.get('last_name', ''),
+            "position": player.get('position') or 'N/A',
+            "team": team or 'FA',
+            "player_image_url": SLEEPER_PLAYER_IMAGE_URL.format(player_id=player_id),
+            "team_logo_url": SLEEPER_TEAM_LOGO_URL.format(team=team.lower()) if team else '',
+            "pick_cost": pick_cost,
+        },
+        "owner": {"display_name": users[owner_user_id].get('display_name'), "email": emails.get(owner_user_id)},
+        "recipients": [email for user_id, email in emails.items() if email and user_id != owner_user_id],
+        "league_name": (bundle['league'] or {}).get('name', ''),
+    }
+
+
+def prewarm_taxi_resolver():
+    """
+    Load the id-based taxi path's modules + DynamoDB resource (imported lazily above).
+    Registered by the lambdas that serve taxi steals, not here - other email lambdas
+    importing this module shouldn't pay for it.
+    """
+    from lambdas.common import dynamo_helpers, sleeper_helper  # noqa: F401
+    dynamo_helpers.dynamodb_res.get()
+
+
+def validate_taxi_steal(body: dict) -> dict:
+    if 'league_id' in body:
+        require_fields(body, 'league_id', 'stealer_user_id', 'owner_user_id', 'player_id')
+        body = resolve_taxi_steal_payload(
+            league_id=body['league_id'],
+            stealer_user_id=body['stealer_user_id'],
+            owner_user_id=body['owner_user_id'],
+            player_id=body['player_id'],
+            pick_cost=body.get('pick_cost', ''),
+        )
+    require_fields(body, 'stealer', 'player', 'owner', 'recipients', 'league_name')
+    _require_shapes(body, 'validate_taxi_steal', objects=('stealer', 'player', 'owner'), lists=('recipients',))
+    return body
+
+
+def _taxi_fields(payload: dict) -> dict:
+    player = payload['player']
+    return {
+        "stealer_name": payload['stealer'].get('display_name', 'A league member'),
+        "player_name": f"{player.get('first_name', '')} {player.get('last_name', '')}".strip() or 'Unknown Player',
+        "player_position": player.get('position', 'N/A'),
+        "player_team": player.get('team', 'N/A'),
+        "league_url": XOMPER_URL,
+        "league_name": payload.get('league_name', ''),
+        "pick_cost": player.get('pick_cost', ''),
+    }
+
+
+def build_taxi_steal_content(payload: dict) -> dict:
+    fields = _taxi_fields(payload)
+    owner_name = payload['owner'].get('display_name', 'Unknown')
+    images = {
+        "player_image_url": payload['player'].get('player_image_url', ''),
+        "team_logo_url": payload['player'].get('team_logo_url', ''),
+    }
+    stealer_name, player_name = fields['stealer_name'], fields['player_name']
+    log.info(f"{stealer_name} stealing {player_name} from {owner_name}. Notifying {len(payload['recipients'])} members.")
+
+    content = {
+        "league": (
+            f"Taxi Squad Alert: {stealer_name} is stealing {player_name}!",
+            email_templates.generate_taxi_steal_league_email(target_owner_name=owner_name, **fields, **images),
+            email_templates.generate_taxi_steal_league_email_plain_text(target_owner_name=owner_name, **fields),
+        )
+    }
+    # Targeted owner notification
+    if payload['owner'].get('email'):
+        content["owner"] = (
+            f"URGENT: {stealer_name} is stealing {player_name} from your taxi squad!",
+            email_templates.generate_taxi_steal_owner_email(owner_name=owner_name, **fields, **images),
+            email_templates.generate_taxi_steal_owner_email_plain_text(owner_name=owner_name, **fields),
+        )
+    return content
+
+
+def taxi_steal_recipients(payload: dict) -> dict:
+    owner_email = payload['owner'].get('email')
+    return {"league": payload['recipients'], "owner": [owner_email] if owner_email else []}
+
+
+# ============================================
+# Registry
+# ============================================
+# Taxi steals aren't digested - each steal is its own time-sensitive alert
+
+register_notification_type(NotificationType(
+    'rule_proposal', validate_rule_proposal, build_rule_proposal_content, _league_recipients, digest=True,
+    persist=persist_rule_proposal,
+))
+register_notification_type(NotificationType(
+    'rule_accept', validate_rule_result,
+    _rule_result_builder('ACCEPTED', 'Rule APPROVED', 'generate_rule_accepted_email', 'generate_rule_accepted_email_plain_text'),
+    _league_recipients, digest=True,
+))
+register_notification_type(NotificationType(
+    'rule_deny', validate_rule_result,
+    _rule_result_builder('DENIED', 'Rule DENIED', 'generate_rule_denied_email', 'generate_rule_denied_email_plain_text'),
+    _league_recipients, digest=True,
+))
+register_notification_type(NotificationType(
+    'taxi_steal', validate_taxi_steal, build_taxi_steal_content, taxi_steal_recipients,
+))
+
+# API routes served by the dispatcher -> notification type
+ROUTE_NOTIFICATION_TYPES = {
+    '/email/rule-proposal': 'rule_proposal',
+    '/email/rule-accept': 'rule_accept',
+    '/email/rule-deny': 'rule_deny',
+    '/email/taxi': 'taxi_steal',
+}
+BATCH_ROUTE = '/email/batch'
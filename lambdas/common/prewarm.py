@@ -0,0 +1,133 @@
+"""
+Xomper Prewarm Registry
+=======================
+Run one-off warm-up work (client creation, secret fetches...) in the Lambda
+init phase instead of on the first request.
+
+Modules register warm-up callables when they're imported; handle_errors starts
+them all in parallel when it decorates the handler (i.e. at the end of init),
+waiting at most PREWARM_BUDGET_SECONDS. Anything still running after the
+budget keeps going in the background. On the first request the decorator logs
+which warmups were done, still pending or failed. Modules imported after
+prewarming started (lazy imports) have their warmups started immediately.
+
+Usage:
+    from lambdas.common.prewarm import register_prewarm
+
+    register_prewarm('ses_client', ses_client.get)
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from lambdas.common.logger import get_logger
+
+log = get_logger(__file__)
+
+PREWARM_BUDGET_SECONDS = float(os.environ.get('PREWARM_BUDGET_SECONDS', '2'))
+# Only on Lambda by default - local imports/scripts shouldn't create clients or call AWS
+PREWARM_ENABLED = os.environ.get('PREWARM_ENABLED', 'true' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'false').lower() == 'true'
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class PrewarmRegistry:
+    """Named warm-up callables, run at most once per container."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._warmups = {}
+        self._status = {}
+        self._started = None
+        self._threads = []
+        self._first_request_reported = False
+
+    def register(self, name: str, warmup: Callable):
+        with self._lock:
+            if name in self._warmups:
+                return
+            self._warmups[name] = warmup
+            self._status[name] = {'state': PENDING, 'ms': None}
+            run_now = self._started is not None
+        if run_now:
+            self._spawn(name, warmup)
+
+    def _spawn(self, name: str, warmup: Callable):
+        thread = threading.Thread(target=self._run, args=(name, warmup), name=f"prewarm-{name}", daemon=True)
+        thread.start()
+        with self._lock:
+            self._threads.append(thread)
+
+    def _run(self, name: str, warmup: Callable):
+        started = time.perf_counter()
+        try:
+            warmup()
+            state = DONE
+        except Exception as err:
+            log.warning(f"Prewarm {name} failed: {err}")
+            state = FAILED
+        with self._lock:
+            self._status[name] = {'state': state, 'ms': round((time.perf_counter() - started) * 1000, 1)}
+
+    def start(self, budget_seconds: float = PREWARM_BUDGET_SECONDS) -> dict:
+        """Run every registered warmup in parallel, waiting up to budget_seconds. Only the first call does anything."""
+        with self._lock:
+            already_started = self._started is not None
+            if not already_started:
+                self._started = time.perf_counter()
+                warmups = list(self._warmups.items())
+        if already_started:
+            return self.status()
+
+        for name, warmup in warmups:
+            self._spawn(name, warmup)
+        # Keep waiting on warmups spawned along the way (modules a warmup imported) until the budget runs out
+        deadline = time.monotonic() + budget_seconds
+        while time.monotonic() < deadline:
+            with self._lock:
+                running = [thread for thread in self._threads if thread.is_alive()]
+            if not running:
+                break
+            running[0].join(max(0.0, deadline - time.monotonic()))
+
+        status = self.status()
+        log.info(f"Prewarm finished init wait in {(time.perf_counter() - self._started) * 1000:.0f}ms: {json.dumps(status)}")
+        return status
+
+    def status(self) -> dict:
+        with self._lock:
+            return {name: dict(status) for name, status in self._status.items()}
+
+    def report_first_request(self) -> Optional[dict]:
+        """Status as of the first request in this container (None on later requests)."""
+        with self._lock:
+            if self._started is None or self._first_request_reported:
+                return None
+            self._first_request_reported = True
+        status = self.status()
+        log.info(f"Prewarm state at first request: {json.dumps(status)}")
+        return status
+
+
+PREWARM_REGISTRY = PrewarmRegistry()
+
+
+def register_prewarm(name: str, warmup: Callable):
+    """Register a warm-up callable to run during init. Names are unique - later registrations are ignored."""
+    PREWARM_REGISTRY.register(name, warmup)
+
+
+def start_prewarm(budget_seconds: float = PREWARM_BUDGET_SECONDS) -> dict:
+    """Run registered warmups (no-op unless PREWARM_ENABLED, and only once per container)."""
+    if not PREWARM_ENABLED:
+        return {}
+    return PREWARM_REGISTRY.start(budget_seconds)
+
+
+def get_prewarm_status() -> dict:
+    return PREWARM_REGISTRY.status()
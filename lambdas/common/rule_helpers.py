@@ -0,0 +1,108 @@
+from lambdas.common.constants import RULE_PROPOSALS_TABLE_NAME
+from lambdas.common.dynamo_helpers import add_unique_set_member, get_item_by_key, update_table_item
+from lambdas.common.errors import ConflictError, NotFoundError, ValidationError
+from lambdas.common.logger import get_logger
+from lambdas.common.utility_helpers import get_timestamp
+
+log = get_logger(__file__)
+
+HANDLER = 'rule_helpers'
+
+# Rule proposals table - one item per proposal, keyed on proposal_id:
+#   proposal        title / description / proposed_by_username / league_name
+#   approved_by     string set of voter user ids (rejected_by likewise)
+#   approve_count   running tallies (reject_count likewise)
+#   voter_names     user id -> display name, for the accept/deny emails
+# Each vote is a single conditional UpdateItem, so a voter can only ever land on one side once.
+PROPOSAL_KEY = 'proposal_id'
+VOTE_APPROVE = 'approve'
+VOTE_REJECT = 'reject'
+VOTE_ATTRIBUTES = {
+    VOTE_APPROVE: ('approved_by', 'approve_count'),
+    VOTE_REJECT: ('rejected_by', 'reject_count'),
+}
+
+
+def create_rule_proposal(proposal_id: str, proposal: dict) -> dict:
+    """
+    Store a new proposal with empty tallies. Idempotent - if the id already holds the
+    same proposal (e.g. a retried request) the stored item is returned. Raises
+    ConflictError if the id is taken by a different proposal.
+    """
+    item = {
+        PROPOSAL_KEY: proposal_id,
+        'proposal': proposal,
+        'approve_count': 0,
+        'reject_count': 0,
+        'voter_names': {},
+        'created_at': get_timestamp(),
+    }
+    try:
+        update_table_item(RULE_PROPOSALS_TABLE_NAME, item, expected_version=0)
+    except ConflictError:
+        existing = get_item_by_key(RULE_PROPOSALS_TABLE_NAME, PROPOSAL_KEY, proposal_id, override=True)
+        if existing.get('proposal') != proposal:
+            raise ConflictError(
+                f"Rule proposal {proposal_id} already exists with different content",
+                HANDLER, 'create_rule_proposal', resource='rule_proposal'
+            )
+        log.info(f"Rule proposal {proposal_id} already stored, reusing it.")
+        return existing
+    log.info(f"Created rule proposal {proposal_id}: {proposal.get('title', 'Untitled Rule')}")
+    return item
+
+
+def get_voter_display_name(user_id: str) -> str:
+    """Voter's name for the accept/deny emails, from their (cached) Sleeper user - falls back to the user id."""
+    from lambdas.common.sleeper_helper import get_sleeper_user  # requests only loaded for this path
+
+    try:
+        return (get_sleeper_user(user_id) or {}).get('display_name') or user_id
+    except Exception as err:
+        log.warning(f"Could not load Sleeper user {user_id} for their display name: {err}")
+        return user_id
+
+
+def record_vote(proposal_id: str, user_id: str, vote: str, display_name: str = None) -> dict:
+    """
+    Record one vote atomically and return the updated tally.
+    Raises ConflictError if user_id already voted (either way), NotFoundError for an unknown proposal.
+    """
+    if vote not in VOTE_ATTRIBUTES:
+        raise ValidationError(f"vote must be one of {sorted(VOTE_ATTRIBUTES)}", HANDLER, 'record_vote', field='vote')
+    set_attr, count_attr = VOTE_ATTRIBUTES[vote]
+    other_set_attr = next(attrs[0] for name, attrs in VOTE_ATTRIBUTES.items() if name != vote)
+
+    item = add_unique_set_member(
+        RULE_PROPOSALS_TABLE_NAME,
+        PROPOSAL_KEY,
+        proposal_id,
+        set_attr,
+        user_id,
+        count_attr=count_attr,
+        exclusive_set_attrs=(other_set_attr,),
+        labels_attr='voter_names',
+        label=display_name or user_id,
+    )
+    log.info(f"Recorded {vote} vote from {user_id} on rule proposal {proposal_id}.")
+    return _format_tally(item)
+
+
+def get_vote_tally(proposal_id: str) -> dict:
+    """Load a proposal and its tally. Raises NotFoundError for an unknown proposal."""
+    item = get_item_by_key(RULE_PROPOSALS_TABLE_NAME, PROPOSAL_KEY, proposal_id, override=True)
+    if not item:
+        raise NotFoundError(f"Rule proposal {proposal_id} not found", HANDLER, 'get_vote_tally', resource='rule_proposal')
+    return _format_tally(item)
+
+
+def _format_tally(item: dict) -> dict:
+    names = item.get('voter_names') or {}
+    return {
+        "proposal_id": item[PROPOSAL_KEY],
+        "proposal": item.get('proposal') or {},
+        "approved_by": sorted(names.get(user_id, user_id) for user_id in item.get('approved_by', ())),
+        "rejected_by": sorted(names.get(user_id, user_id) for user_id in item.get('rejected_by', ())),
+        "approve_count": int(item.get('approve_count', 0)),
+        "reject_count": int(item.get('reject_count', 0)),
+    }
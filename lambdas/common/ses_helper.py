@@ -1,12 +1,14 @@
 import asyncio
-import boto3
 from botocore.exceptions import ClientError
+from lambdas.common.aws_clients import lazy_client
+from lambdas.common.prewarm import register_prewarm
 from lambdas.common.constants import FROM_EMAIL, AWS_DEFAULT_REGION
 from lambdas.common.logger import get_logger
 
 log = get_logger(__file__)
 
-ses_client = boto3.client('ses', region_name=AWS_DEFAULT_REGION)
+ses_client = lazy_client('ses', region_name=AWS_DEFAULT_REGION)
+register_prewarm('ses_client', ses_client.get)
 
 
 def send_email(to_email: str, subject: str, html_body: str, text_body: str, tags: list = None) -> bool:
@@ -35,7 +37,7 @@ def send_email(to_email: str, subject: str, html_body: str, text_body: str, tags
         return False
 
 
-def send_emails_concurrently(email_tasks: list) -> tuple:
+def send_emails_with_results(email_tasks: list) -> list:
     """
     Send multiple emails concurrently using asyncio.
 
@@ -43,7 +45,7 @@ def send_emails_concurrently(email_tasks: list) -> tuple:
         email_tasks: List of (to_email, subject, html_body, text_body) tuples
 
     Returns:
-        Tuple of (successes, failures)
+        List of per-email success flags, in task order
     """
     async def _send(to_email, subject, html_body, text_body):
         return await asyncio.to_thread(send_email, to_email, subject, html_body, text_body)
@@ -51,6 +53,19 @@ def send_emails_concurrently(email_tasks: list) -> tuple:
     async def _run():
         return await asyncio.gather(*[_send(*task) for task in email_tasks])
 
-    results = asyncio.run(_run())
+    return list(asyncio.run(_run())) if email_tasks else []
+
+
+def send_emails_concurrently(email_tasks: list) -> tuple:
+    """
+    Send multiple emails concurrently using asyncio.
+
+    Args:
+        email_tasks: List of (to_email, subject, html_body, text_body) tuples
+
+    Returns:
+        Tuple of (successes, failures)
+    """
+    results = send_emails_with_results(email_tasks)
     successes = sum(1 for r in results if r)
     return successes, len(results) - successes
@@ -1,80 +1,632 @@
-import requests
+import asyncio
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 
+from lambdas.common.constants import SLEEPER_CACHE_TABLE_NAME, SLEEPER_CACHE_TABLE_ENABLED
+from lambdas.common.dynamo_helpers import encode_payload, get_item_by_key_fast, update_table_item
+from lambdas.common.errors import SleeperAPIError
 from lambdas.common.logger import get_logger
+from lambdas.common.metrics import run_in_background
+from lambdas.common.prewarm import register_prewarm
 
 log = get_logger(__file__)
 SLEEPER_URL_BASE = "https://api.sleeper.app/v1"
 
+# Sleeper asks clients to stay under ~1000 calls/minute - keep some headroom
+SLEEPER_RATE_LIMIT_PER_MINUTE = 900
+SLEEPER_RATE_LIMIT_BURST = 50
+SLEEPER_REQUEST_TIMEOUT_SECONDS = 10
+SLEEPER_MAX_RETRIES = 3
+SLEEPER_BACKOFF_BASE_SECONDS = 0.5
+SLEEPER_BACKOFF_MAX_SECONDS = 8
+SLEEPER_BREAKER_FAILURE_THRESHOLD = 5
+SLEEPER_BREAKER_COOLDOWN_SECONDS = 30
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# In-memory cache policy per endpoint (seconds). Entries older than ttl but
+# within ttl + stale are served immediately while a background refresh runs.
+SLEEPER_CACHE_POLICIES = {
+    "league": {"ttl": 3600, "stale": 86400},
+    "league_users": {"ttl": 1800, "stale": 86400},
+    "league_rosters": {"ttl": 300, "stale": 3600},
+    "user": {"ttl": 3600, "stale": 86400},
+}
+SLEEPER_CACHE_MAX_ENTRIES = 256
+
+# Shared DynamoDB cache - bump the version when the payload format changes
+SLEEPER_L2_CACHE_VERSION = 2
+SLEEPER_L2_CACHE_KEY = 'cache_key'
+
+
+# ============================================
+# Rate Limiting & Circuit Breaking
+# ============================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every Sleeper call in the container.
+
+    Usage:
+        limiter = TokenBucket(rate_per_minute=900, capacity=50)
+        limiter.acquire()  # blocks until a token is available
+    """
+
+    def __init__(self, rate_per_minute: int, capacity: int):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.throttled_count = 0
+        self.total_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if the bucket is empty. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    if waited:
+                        self.throttled_count += 1
+                        self.total_wait_seconds += waited
+                    return waited
+                wait = (1 - self.tokens) / self.rate_per_second
+            time.sleep(wait)
+            waited += wait
+
+    def metrics(self) -> dict:
+        with self._lock:
+            self._refill()
+            return {
+                "tokens": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "ratePerMinute": round(self.rate_per_second * 60),
+                "throttledCount": self.throttled_count,
+                "totalWaitSeconds": round(self.total_wait_seconds, 3),
+            }
+
+
+class CircuitBreaker:
+    """
+    Fails fast with SleeperAPIError once Sleeper has failed `failure_threshold`
+    times in a row. After `cooldown_seconds` a single trial request is let
+    through (half-open); success closes the breaker, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.opened_count = 0
+        self.rejected_count = 0
+        self._lock = threading.Lock()
+
+    def before_request(self, endpoint: str, function: str = "unknown"):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self.state = self.HALF_OPEN
+                log.info("Sleeper circuit breaker half-open, sending trial request.")
+                return
+            self.rejected_count += 1
+            raise SleeperAPIError(
+                message="Sleeper API circuit breaker open, failing fast",
+                function=function,
+                endpoint=endpoint
+            )
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                log.info("Sleeper circuit breaker closed.")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened_count += 1
+                    log.warning(f"Sleeper circuit breaker OPEN for {self.cooldown_seconds}s after {self.consecutive_failures} failures.")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutiveFailures": self.consecutive_failures,
+                "openedCount": self.opened_count,
+                "rejectedCount": self.rejected_count,
+                "retryInSeconds": round(retry_in, 1),
+            }
+
+
+# Shared per container
+SLEEPER_RATE_LIMITER = TokenBucket(SLEEPER_RATE_LIMIT_PER_MINUTE, SLEEPER_RATE_LIMIT_BURST)
+SLEEPER_CIRCUIT_BREAKER = CircuitBreaker(SLEEPER_BREAKER_FAILURE_THRESHOLD, SLEEPER_BREAKER_COOLDOWN_SECONDS)
+_request_counts = {"requests": 0, "retries": 0, "failures": 0}
+_request_counts_lock = threading.Lock()
+
+
+def _count(name: str):
+    with _request_counts_lock:
+        _request_counts[name] += 1
+
+
+def get_sleeper_client_metrics() -> dict:
+    """Snapshot of limiter, breaker and request counters for this container."""
+    return {
+        "rateLimiter": SLEEPER_RATE_LIMITER.metrics(),
+        "circuitBreaker": SLEEPER_CIRCUIT_BREAKER.metrics(),
+        "singleFlight": SLEEPER_SINGLE_FLIGHT.metrics(),
+        "cache": SLEEPER_CACHE.metrics(),
+        "sharedCache": dict(_l2_stats),
+        **dict(_request_counts),
+    }
+
+
+def _backoff_seconds(attempt: int, retry_after: str = None) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), SLEEPER_BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(SLEEPER_BACKOFF_MAX_SECONDS, SLEEPER_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def _import_requests():
+    import requests  # noqa: F401
+
+
+register_prewarm('requests', _import_requests)
+
+
+def _request_json(url: str, function: str = "unknown"):
+    """
+    GET a Sleeper endpoint through the shared limiter and circuit breaker.
+    Retries 429/5xx and connection errors with backoff, raises SleeperAPIError otherwise.
+    """
+    import requests  # ~80ms to import - only paid by containers that actually call Sleeper (prewarmed in init)
+
+    SLEEPER_CIRCUIT_BREAKER.before_request(url, function)
+
+    error = None
+    for attempt in range(SLEEPER_MAX_RETRIES + 1):
+        if attempt:
+            _count("retries")
+        SLEEPER_RATE_LIMITER.acquire()
+        _count("requests")
+        retry_after = None
+        try:
+            response = requests.get(url, timeout=SLEEPER_REQUEST_TIMEOUT_SECONDS)
+        except requests.RequestException as err:
+            error = str(err)
+        else:
+            if response.status_code == 200:
+                SLEEPER_CIRCUIT_BREAKER.record_success()
+                try:
+                    return response.json()
+                except ValueError as err:
+                    raise SleeperAPIError(f"Invalid JSON from Sleeper: {err}", function=function, endpoint=url)
+
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                # Sleeper answered, it just didn't like the request - not a breaker failure
+                SLEEPER_CIRCUIT_BREAKER.record_success()
+                raise SleeperAPIError(f"Sleeper returned {response.status_code}", function=function, endpoint=url)
+            error = response.status_code
+            retry_after = response.headers.get('Retry-After')
+
+        if attempt < SLEEPER_MAX_RETRIES:
+            delay = _backoff_seconds(attempt, retry_after)
+            log.warning(f"Sleeper request to {url} failed ({error}), retrying in {delay:.2f}s...")
+            time.sleep(delay)
+
+    _count("failures")
+    SLEEPER_CIRCUIT_BREAKER.record_failure()
+    raise SleeperAPIError(
+        message=f"Sleeper request failed after {SLEEPER_MAX_RETRIES + 1} attempts: {error}",
+        function=function,
+        endpoint=url
+    )
+
+
+# ============================================
+# Request Coalescing (single-flight)
+# ============================================
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one upstream call.
+    The first caller (leader) runs the fetch, everyone else arriving while it
+    is in flight waits and gets the same parsed result (or exception).
+
+    Shared results are the same object for every caller - treat them as read-only.
+    """
+
+    def __init__(self):
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fetch):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _InFlightCall()
+                self.upstream_calls += 1
+            else:
+                self.coalesced_calls += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+            return call.result
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "upstreamCalls": self.upstream_calls,
+                "coalescedCalls": self.coalesced_calls,
+                "inFlight": len(self._calls),
+            }
+
+
+SLEEPER_SINGLE_FLIGHT = SingleFlight()
+
+
+def _fetch_json(url: str, function: str = "unknown", policy: str = None, generation: int = None):
+    """
+    Coalesced fetch - concurrent callers for the same URL share one shared-cache
+    lookup and at most one upstream request.
+
+    Callers that cache the result pass the cache generation they'll store under,
+    so a caller arriving after an invalidation never joins a fetch that started before it.
+    """
+    key = url if generation is None else f"{url}#{generation}"
+    return SLEEPER_SINGLE_FLIGHT.do(key, lambda: _fetch_through_shared_cache(url, function, policy))
+
+
+# ============================================
+# Shared DynamoDB Cache (L2)
+# ============================================
+# Sits under the per-container cache so cold containers reuse what any other
+# container already fetched. Items: cache_key, payload (codec-encoded JSON, see
+# dynamo_helpers.encode_payload), expires_at
+# (epoch seconds, table TTL attribute), version.
+
+_MISS = object()
+_l2_stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def _l2_cache_key(url: str) -> str:
+    return url.replace(SLEEPER_URL_BASE, '', 1).lstrip('/')
+
+
+def _l2_get(url: str):
+    try:
+        item = get_item_by_key_fast(SLEEPER_CACHE_TABLE_NAME, SLEEPER_L2_CACHE_KEY, _l2_cache_key(url))
+        if (
+            not item
+            or item.get('version') != SLEEPER_L2_CACHE_VERSION
+            or int(item.get('expires_at', 0)) <= time.time()
+        ):
+            _l2_stats["misses"] += 1
+            return _MISS
+
+        _l2_stats["hits"] += 1
+        return item['payload']  # decoded by the fast read path
+    except Exception as err:
+        # The shared cache is best effort - never fail a request because of it
+        _l2_stats["errors"] += 1
+        log.warning(f"Sleeper shared cache read failed for {url}: {err}")
+        return _MISS
+
+
+def _l2_put(url: str, value, ttl_seconds: int):
+    try:
+        update_table_item(SLEEPER_CACHE_TABLE_NAME, {
+            SLEEPER_L2_CACHE_KEY: _l2_cache_key(url),
+            'payload': encode_payload(value),
+            'expires_at': int(time.time() + ttl_seconds),
+            'version': SLEEPER_L2_CACHE_VERSION,
+            'last_updated': datetime.utcnow().isoformat()
+        })
+        _l2_stats["writes"] += 1
+    except Exception as err:
+        _l2_stats["errors"] += 1
+        log.warning(f"Sleeper shared cache write failed for {url}: {err}")
+
+
+def _l2_expire(url: str):
+    # Tombstone instead of delete - reads treat an expired expires_at as a miss and table TTL
+    # reaps it (TTL ignores timestamps more than 5 years old, so it must be "now", not 0)
+    try:
+        update_table_item(SLEEPER_CACHE_TABLE_NAME, {
+            SLEEPER_L2_CACHE_KEY: _l2_cache_key(url),
+            'expires_at': int(time.time()),
+            'version': SLEEPER_L2_CACHE_VERSION
+        })
+    except Exception as err:
+        _l2_stats["errors"] += 1
+        log.warning(f"Sleeper shared cache expire failed for {url}: {err}")
+
+
+def _fetch_through_shared_cache(url: str, function: str, policy: str = None):
+    # Uncached endpoints (e.g. the 5MB players dump) skip the shared cache entirely
+    if policy is None or not SLEEPER_CACHE_TABLE_ENABLED:
+        return _request_json(url, function)
+
+    value = _l2_get(url)
+    if value is not _MISS:
+        return value
+
+    value = _request_json(url, function)
+    _l2_put(url, value, SLEEPER_CACHE_POLICIES[policy]["ttl"])
+    return value
+
+
+# ============================================
+# In-Memory TTL Cache (stale-while-revalidate)
+# ============================================
+
+class _CacheEntry:
+    def __init__(self, value, policy: str):
+        self.value = value
+        self.policy = policy
+        self.fetched_at = time.monotonic()
+
+
+class SleeperCache:
+    """
+    Per-container LRU cache of parsed Sleeper responses keyed by URL.
+    Freshness is decided per endpoint policy (see SLEEPER_CACHE_POLICIES).
+
+    Every invalidation bumps a generation counter so a fetch that started
+    before the invalidation can't write pre-invalidation data back.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.stats = {"hits": 0, "staleHits": 0, "misses": 0, "refreshes": 0, "invalidations": 0}
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, url: str, policy: str):
+        """Returns (value, state) where state is 'fresh', 'stale' or None on a miss."""
+        rules = SLEEPER_CACHE_POLICIES[policy]
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                age = time.monotonic() - entry.fetched_at
+                if age < rules["ttl"]:
+                    self._entries.move_to_end(url)
+                    self.stats["hits"] += 1
+                    return entry.value, "fresh"
+                if age < rules["ttl"] + rules["stale"]:
+                    self._entries.move_to_end(url)
+                    self.stats["staleHits"] += 1
+                    return entry.value, "stale"
+                del self._entries[url]
+            self.stats["misses"] += 1
+            return None, None
+
+    def store(self, url: str, value, policy: str, generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[url] = _CacheEntry(value, policy)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def start_refresh(self, url: str) -> bool:
+        with self._lock:
+            if url in self._refreshing:
+                return False
+            self._refreshing.add(url)
+            self.stats["refreshes"] += 1
+            return True
+
+    def finish_refresh(self, url: str):
+        with self._lock:
+            self._refreshing.discard(url)
+
+    def invalidate(self, prefix: str = None) -> int:
+        with self._lock:
+            self.generation += 1
+            self.stats["invalidations"] += 1
+            if prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            # Path prefix match - /league/12 shouldn't drop /league/123
+            keys = [url for url in self._entries if url == prefix or url.startswith(f"{prefix.rstrip('/')}/")]
+            for url in keys:
+                del self._entries[url]
+            return len(keys)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["staleHits"] + self.stats["misses"]
+            served = self.stats["hits"] + self.stats["staleHits"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hitRatio": round(served / lookups, 3) if lookups else 0.0,
+            }
+
+
+SLEEPER_CACHE = SleeperCache(SLEEPER_CACHE_MAX_ENTRIES)
+
+
+def _load_and_cache(url: str, function: str, policy: str):
+    generation = SLEEPER_CACHE.generation
+    value = _fetch_json(url, function, policy, generation)
+    SLEEPER_CACHE.store(url, value, policy, generation)
+    return value
+
+
+def _refresh_in_background(url: str, function: str, policy: str):
+    if not SLEEPER_CACHE.start_refresh(url):
+        return
+
+    def _refresh():
+        try:
+            _load_and_cache(url, function, policy)
+        except Exception as err:
+            # Keep serving the stale copy, next lookup will try again
+            log.warning(f"Background refresh of {url} failed: {err}")
+        finally:
+            SLEEPER_CACHE.finish_refresh(url)
+
+    # Can outlive this invocation - keep its cache reads/writes out of the next one's metrics
+    run_in_background(_refresh, name='sleeper-refresh')
+
+
+def _cached_fetch_json(url: str, function: str, policy: str):
+    value, state = SLEEPER_CACHE.lookup(url, policy)
+    if state == "stale":
+        _refresh_in_background(url, function, policy)
+    if state:
+        return value
+    return _load_and_cache(url, function, policy)
+
+
+async def _cached_fetch_json_async(url: str, function: str, policy: str):
+    value, state = SLEEPER_CACHE.lookup(url, policy)
+    if state == "stale":
+        _refresh_in_background(url, function, policy)
+    if state:
+        return value
+    # Run off the event loop so concurrent coroutines can actually overlap (and coalesce)
+    return await asyncio.to_thread(_load_and_cache, url, function, policy)
+
+
+def invalidate_sleeper_cache(url_prefix: str = None) -> int:
+    """
+    Drop in-container cached Sleeper responses at or below the url_prefix path (everything if None).
+    Returns the number of entries removed.
+    """
+    removed = SLEEPER_CACHE.invalidate(url_prefix)
+    log.info(f"Invalidated {removed} cached Sleeper responses ({url_prefix or 'all'}).")
+    return removed
+
+
+def invalidate_league_cache(league_id: str) -> int:
+    """
+    Drop cached league, roster and user data for a league - call after a transaction.
+    Expires the shared DynamoDB copies too so other containers refetch.
+    """
+    league_url = f"{SLEEPER_URL_BASE}/league/{league_id}"
+    if SLEEPER_CACHE_TABLE_ENABLED:
+        for url in (league_url, f"{league_url}/rosters", f"{league_url}/users"):
+            _l2_expire(url)
+    return invalidate_sleeper_cache(league_url)
+
+
+# ============================================
+# Sleeper Endpoints
+# ============================================
+
 def fetch_nfl_players():
     try:
         url = f"{SLEEPER_URL_BASE}/players/nfl"
-        response = requests.get(url)
+        players = _fetch_json(url, 'fetch_nfl_players')  # JSON is a dict with player IDs as keys
+        return players
+    except SleeperAPIError as err:
+        log.error(f"Error Fetching NFL Players:  {err.message}")
+        raise
 
-        if response.status_code == 200:
-            players = response.json()  # JSON is a dict with player IDs as keys
-            return players
-        else:
-            raise Exception(response.status_code)
-    except Exception as err:
-        log.error(f"Error Fetching NFL Players:  {err}")
-        raise Exception(f"Error Fetching NFL Players:  {err}")
-    
 def get_sleeper_user(user_id: str):
     try:
         url = f"{SLEEPER_URL_BASE}/user/{user_id}"
-        response = requests.get(url)
+        user = _cached_fetch_json(url, 'get_sleeper_user', 'user')
+        return user
+    except SleeperAPIError as err:
+        log.error(f"Error Getting Sleeper User:  {err.message}")
+        raise
 
-        if response.status_code == 200:
-            user = response.json()  # JSON is a dict with player IDs as keys
-            return user
-        else:
-            raise Exception(response.status_code)
-    except Exception as err:
-        log.error(f"Error Getting Sleeper User:  {err}")
-        raise Exception(f"Error Getting Sleeper User:  {err}")
-    
 async def get_sleeper_league(league_id: str):
     try:
         url = f"{SLEEPER_URL_BASE}/league/{league_id}"
-        response = requests.get(url)
+        league = await _cached_fetch_json_async(url, 'get_sleeper_league', 'league')
+        return league
+    except SleeperAPIError as err:
+        log.error(f"Error Getting League:  {err.message}")
+        raise
 
-        if response.status_code == 200:
-            league = response.json()  
-            return league
-        else:
-            raise Exception(response.status_code)
-    except Exception as err:
-        log.error(f"Error Getting League:  {err}")
-        raise Exception(f"Error Getting League:  {err}")
-    
 async def get_sleeper_league_rosters(league_id: str):
     try:
         url = f"{SLEEPER_URL_BASE}/league/{league_id}/rosters"
-        response = requests.get(url)
+        rosters = await _cached_fetch_json_async(url, 'get_sleeper_league_rosters', 'league_rosters')
+        return rosters
+    except SleeperAPIError as err:
+        log.error(f"Error Getting League Rosters:  {err.message}")
+        raise
 
-        if response.status_code == 200:
-            league = response.json()  
-            return league
-        else:
-            raise Exception(response.status_code)
-    except Exception as err:
-        log.error(f"Error Getting League Rosters:  {err}")
-        raise Exception(f"Error Getting League Rosters:  {err}")
-    
 async def get_sleeper_league_users(league_id: str):
     try:
         url = f"{SLEEPER_URL_BASE}/league/{league_id}/users"
-        response = requests.get(url)
+        users = await _cached_fetch_json_async(url, 'get_sleeper_league_users', 'league_users')
+        return users
+    except SleeperAPIError as err:
+        log.error(f"Error Getting League Users:  {err.message}")
+        raise
+
+async def get_sleeper_league_bundle(league_id: str) -> dict:
+    """Fetch (cached) league settings, rosters and users for a league concurrently."""
+    league, rosters, users = await asyncio.gather(
+        get_sleeper_league(league_id),
+        get_sleeper_league_rosters(league_id),
+        get_sleeper_league_users(league_id),
+    )
+    return {"league": league, "rosters": rosters, "users": users}
 
-        if response.status_code == 200:
-            league = response.json()  
-            return league
-        else:
-            raise Exception(response.status_code)
-    except Exception as err:
-        log.error(f"Error Getting League Users:  {err}")
-        raise Exception(f"Error Getting League Users:  {err}")
-    
 def __format_players(players: dict):
     return [data for player_id, data in players.items()]
-
@@ -1,14 +1,27 @@
-import boto3
+from lambdas.common.aws_clients import lazy_client
 from lambdas.common.constants import PRODUCT
 
-ssm = boto3.client("ssm", verify=False)
+ssm = lazy_client("ssm", verify=False)
 
 __AWS_ROOT = f'/{PRODUCT}/aws/'
 __API_ROOT = f'/{PRODUCT}/api/'
 
-# AWS
-AWS_ACCESS_KEY = ssm.get_parameter(Name=f'{__AWS_ROOT}ACCESS_KEY', WithDecryption=True)['Parameter']['Value']
-AWS_SECRET_KEY = ssm.get_parameter(Name=f'{__AWS_ROOT}SECRET_KEY', WithDecryption=True)['Parameter']['Value']
+# Parameters are fetched on first access (module __getattr__) and cached for the container,
+# so importing this module costs no SSM calls and each caller only fetches what it reads.
+_PARAMETERS = {
+    # AWS
+    'AWS_ACCESS_KEY': f'{__AWS_ROOT}ACCESS_KEY',
+    'AWS_SECRET_KEY': f'{__AWS_ROOT}SECRET_KEY',
+    #API
+    'API_SECRET_KEY': f'{__API_ROOT}API_SECRET_KEY',
+}
 
-#API
-API_SECRET_KEY = ssm.get_parameter(Name=f'{__API_ROOT}API_SECRET_KEY', WithDecryption=True)['Parameter']['Value']
+def get_parameter(name: str) -> str:
+    return ssm.get_parameter(Name=name, WithDecryption=True)['Parameter']['Value']
+
+def __getattr__(name):
+    if name not in _PARAMETERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = get_parameter(_PARAMETERS[name])
+    globals()[name] = value
+    return value
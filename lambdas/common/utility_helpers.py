@@ -7,9 +7,12 @@ Common utilities for Lambda handlers.
 import json
 import decimal
 import base64
+import hashlib
+import hmac
 from datetime import datetime
 from typing import Any, Optional, Set
 
+from lambdas.common.constants import CURSOR_SECRET_KEY
 from lambdas.common.logger import get_logger
 
 log = get_logger(__file__)
@@ -58,6 +61,16 @@ def is_cron_event(event: dict) -> bool:
     return event.get('source') == 'aws.events'
 
 
+def is_warm_ping(event: dict) -> bool:
+    """
+    Check if the event is a keep-warm ping: {"warmer": true, ...} (EventBridge constant input
+    or a fan-out invoke). Bare scheduled events are not pings - they drive real cron handlers.
+    """
+    if not isinstance(event, dict):
+        return False
+    return event.get('warmer') is True
+
+
 def parse_body(event: dict) -> dict:
     """
     Parse the request body from an event.
@@ -78,6 +91,12 @@ def parse_body(event: dict) -> dict:
     return body if isinstance(body, dict) else {}
 
 
+def get_caller_id(event: dict) -> Optional[str]:
+    """Caller's user id from the API Gateway authorizer context (None if the token carried none)."""
+    authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+    return authorizer.get('user_id') or None
+
+
 def get_query_params(event: dict) -> dict:
     """Get query string parameters from event."""
     return event.get('queryStringParameters') or {}
@@ -88,6 +107,86 @@ def get_path_params(event: dict) -> dict:
     return event.get('pathParameters') or {}
 
 
+# ============================================
+# Pagination
+# ============================================
+
+DEFAULT_PAGE_LIMIT = 25
+MAX_PAGE_LIMIT = 100
+
+
+def get_pagination_params(
+    event: dict,
+    default_limit: int = DEFAULT_PAGE_LIMIT,
+    max_limit: int = MAX_PAGE_LIMIT
+) -> tuple[int, Optional[str]]:
+    """
+    Read ?limit= and ?cursor= from the query string.
+
+    Returns:
+        Tuple of (limit, cursor) - limit clamped to max_limit, cursor None on the first page
+    """
+    from lambdas.common.errors import ValidationError
+
+    params = get_query_params(event)
+    raw_limit = params.get('limit')
+    try:
+        limit = int(raw_limit) if raw_limit not in (None, '') else default_limit
+    except ValueError:
+        raise ValidationError(message="limit must be an integer", field='limit')
+    if limit < 1:
+        raise ValidationError(message="limit must be positive", field='limit')
+    return min(limit, max_limit), params.get('cursor') or None
+
+
+def _cursor_secret() -> bytes:
+    if CURSOR_SECRET_KEY:
+        return CURSOR_SECRET_KEY.encode('utf-8')
+    # Derived, so the JWT signing key itself never signs anything else
+    from lambdas.common import ssm_helpers
+    return hmac.new(ssm_helpers.API_SECRET_KEY.encode('utf-8'), b'cursor', hashlib.sha256).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def encode_cursor(position: dict, scope: str) -> str:
+    """
+    Build an opaque, HMAC-signed, url-safe cursor.
+
+    Args:
+        position: JSON-serializable resume position (e.g. a wire-format LastEvaluatedKey)
+        scope: What the cursor is valid for (table + query) - replaying it elsewhere fails
+    """
+    payload = json.dumps({'p': position, 's': scope}, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    signature = hmac.new(_cursor_secret(), payload, hashlib.sha256).digest()
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+
+def decode_cursor(cursor: str, scope: str) -> dict:
+    """Verify and unpack a cursor from encode_cursor. Raises ValidationError if it was tampered with or is for another scope."""
+    from lambdas.common.errors import ValidationError
+
+    try:
+        encoded_payload, encoded_signature = cursor.split('.')
+        payload = _b64decode(encoded_payload)
+        expected = hmac.new(_cursor_secret(), payload, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(encoded_signature)):
+            raise ValueError("bad signature")
+        data = json.loads(payload)
+    except (ValueError, TypeError) as err:
+        log.warning(f"Rejected pagination cursor: {err}")
+        raise ValidationError(message="Invalid cursor", field='cursor')
+    if data.get('s') != scope:
+        raise ValidationError(message="Cursor does not belong to this query", field='cursor')
+    return data['p']
+
+
 # ============================================
 # Response Building
 # ============================================
@@ -100,7 +199,7 @@ CORS_HEADERS = {
 }
 
 
-def success_response(body: Any, status_code: int = 200, is_api: bool = True) -> dict:
+def success_response(body: Any, status_code: int = 200, is_api: bool = True, next_cursor: Optional[str] = None) -> dict:
     """
     Build a successful Lambda response.
     
@@ -108,10 +207,13 @@ def success_response(body: Any, status_code: int = 200, is_api: bool = True) ->
         body: Response data (will be JSON encoded if is_api=True)
         status_code: HTTP status code (default 200)
         is_api: If True, JSON encode the body
+        next_cursor: Cursor for the next page, added to a dict body as nextCursor (omitted on the last page)
         
     Returns:
         Lambda response dict
     """
+    if next_cursor:
+        body = {**body, "nextCursor": next_cursor}
     return {
         "statusCode": status_code,
         "headers": CORS_HEADERS,
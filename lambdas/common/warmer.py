@@ -0,0 +1,133 @@
+"""
+Xomper Warm Pings
+=================
+Keep-warm protocol for scheduled EventBridge pings.
+
+A ping is answered before any request parsing, logging context or business
+logic runs (handle_errors and warm_ping_handler check for it first).
+
+Ping event (EventBridge rule with constant input):
+    {"warmer": true, "concurrency": 3}
+
+With concurrency N > 1 the container that receives the ping invokes its own
+function N - 1 more times in parallel. Each target holds for delay_ms so the
+invokes can't share a container, which keeps N containers warm.
+
+Ping response:
+    {
+        "warmer": true,
+        "cold": false,            # was this container cold when the ping arrived
+        "containerId": "...",
+        "invocations": 12,        # invocations this container has served
+        "containers": {"invoked": 3, "cold": 1, "warm": 2, "errors": 0}
+    }
+"""
+
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from lambdas.common.aws_clients import lazy_client
+from lambdas.common.constants import AWS_DEFAULT_REGION
+from lambdas.common.logger import get_logger
+from lambdas.common.utility_helpers import is_warm_ping
+
+log = get_logger(__file__)
+
+WARM_PING_DEFAULT_DELAY_MS = 75
+WARM_PING_MAX_CONCURRENCY = 20
+
+lambda_client = lazy_client('lambda', region_name=AWS_DEFAULT_REGION)
+
+_container = {
+    'id': uuid.uuid4().hex[:12],
+    'cold': True,
+    'invocations': 0,
+}
+
+
+def record_invocation() -> bool:
+    """Count an invocation on this container; returns True if it was the container's first (cold)."""
+    cold = _container['cold']
+    _container['cold'] = False
+    _container['invocations'] += 1
+    return cold
+
+
+def _invoke_target(function_arn: str, delay_ms: int) -> dict:
+    try:
+        response = lambda_client.invoke(
+            FunctionName=function_arn,
+            InvocationType='RequestResponse',
+            Payload=json.dumps({'warmer': True, 'concurrency': 1, 'target': True, 'delay_ms': delay_ms}).encode('utf-8'),
+        )
+        if response.get('FunctionError'):
+            return {'error': response['FunctionError']}
+        return json.loads(response['Payload'].read() or b'{}')
+    except Exception as err:
+        return {'error': str(err)}
+
+
+def _fan_out(context, count: int, delay_ms: int) -> dict:
+    # invoked_function_arn keeps the alias/version the ping was sent to
+    function_arn = getattr(context, 'invoked_function_arn', None) or getattr(context, 'function_name', None)
+    if not function_arn:
+        log.warning("Warm ping fan-out skipped: no function name on context.")
+        return {'invoked': 0, 'cold': 0, 'warm': 0, 'errors': count}
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        results = list(executor.map(lambda _: _invoke_target(function_arn, delay_ms), range(count)))
+    errors = [result['error'] for result in results if 'error' in result]
+    if errors:
+        log.warning(f"Warm ping fan-out: {len(errors)} of {count} invokes failed ({errors[0]})")
+    return {
+        'invoked': count,
+        'cold': sum(1 for result in results if result.get('cold')),
+        'warm': sum(1 for result in results if 'error' not in result and not result.get('cold')),
+        'errors': len(errors),
+    }
+
+
+def handle_warm_ping(event: dict, context, handler_name: str = 'unknown') -> dict:
+    """Answer a warm ping, fanning out if it asks for more than one container."""
+    cold = record_invocation()
+    response = {'warmer': True, 'cold': cold, 'containerId': _container['id'], 'invocations': _container['invocations']}
+
+    if event.get('target'):
+        # Fan-out target - hold briefly so parallel invokes land on separate containers
+        time.sleep(max(0, int(event.get('delay_ms', WARM_PING_DEFAULT_DELAY_MS))) / 1000)
+        return response
+
+    try:
+        concurrency = max(1, min(int(event.get('concurrency', 1)), WARM_PING_MAX_CONCURRENCY))
+    except (TypeError, ValueError):
+        concurrency = 1
+    containers = {'invoked': 1, 'cold': int(cold), 'warm': int(not cold), 'errors': 0}
+    if concurrency > 1:
+        fan_out = _fan_out(context, concurrency - 1, int(event.get('delay_ms', WARM_PING_DEFAULT_DELAY_MS)))
+        containers = {key: containers[key] + fan_out[key] for key in containers}
+    response['containers'] = containers
+    log.info(f"Warm ping {handler_name}: {json.dumps(containers)}")
+    return response
+
+
+def warm_ping_handler(handler_name: str):
+    """
+    Answer warm pings before the wrapped handler runs - for handlers not wrapped in
+    handle_errors (which already does this), e.g. the API Gateway authorizer.
+
+    Usage:
+        @warm_ping_handler("authorizer")
+        def handler(event, context):
+            ...
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(event, context):
+            if is_warm_ping(event):
+                return handle_warm_ping(event, context, handler_name)
+            record_invocation()
+            return func(event, context)
+        return wrapper
+    return decorator
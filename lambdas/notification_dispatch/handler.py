@@ -0,0 +1,85 @@
+"""
+Notification Dispatcher - one warm pool for all notification email traffic
+Routes on notification type through the registry in lambdas.common.notifications.
+
+Serves:
+    POST /notify              {"type": "rule_accept", ...type-specific body...}
+    POST /email/rule-proposal (type rule_proposal)
+    POST /email/rule-accept   (type rule_accept)
+    POST /email/rule-deny     (type rule_deny)
+    POST /email/taxi          (type taxi_steal)
+    POST /email/batch         {"notifications": [{"type": "rule_accept", ...}, {"type": "taxi_steal", ...}]}
+
+The legacy routes take exactly the bodies documented on their per-route handlers;
+an explicit "type" in the body wins over the route.
+
+Returns:
+{
+    "type": "rule_accept",
+    "successfulEmails": 5,
+    "failedEmails": 0
+}
+
+A batch renders each distinct email once and sends everything through one fan-out.
+Returns totals plus one result per notification, in request order:
+{
+    "successfulEmails": 14,
+    "failedEmails": 0,
+    "results": [
+        {"index": 0, "type": "rule_accept", "status": 200, "successfulEmails": 12, "failedEmails": 0, "deduplicatedEmails": 0},
+        {"index": 1, "type": "taxi_steal", "status": 404, "error": {...}},
+        ...
+    ]
+}
+"""
+from lambdas.common.logger import get_logger
+from lambdas.common.errors import handle_errors, ValidationError
+from lambdas.common.utility_helpers import success_response, parse_body
+from lambdas.common.notifications import (
+    dispatch_notification,
+    dispatch_notification_batch,
+    ROUTE_NOTIFICATION_TYPES,
+    BATCH_ROUTE,
+    prewarm_taxi_resolver,
+)
+from lambdas.common.prewarm import register_prewarm
+
+log = get_logger(__file__)
+
+HANDLER = 'notification_dispatch'
+
+register_prewarm('taxi_resolver', prewarm_taxi_resolver)
+
+
+def _route(event: dict) -> str:
+    return (event.get('resource') or event.get('path') or event.get('rawPath') or '').rstrip('/')
+
+
+def resolve_notification_type(event: dict, body: dict) -> str:
+    """Notification type from the body's "type", else from the API route it came in on."""
+    if body.get('type'):
+        return body['type']
+    path = _route(event)
+    for route, notification_type in ROUTE_NOTIFICATION_TYPES.items():
+        if path.endswith(route):
+            return notification_type
+    raise ValidationError(
+        message="Missing notification type",
+        handler=HANDLER,
+        function='resolve_notification_type',
+        field='type'
+    )
+
+
+@handle_errors(HANDLER)
+def handler(event, context):
+    body = parse_body(event)
+    if _route(event).endswith(BATCH_ROUTE):
+        log.info(f"Dispatching batch of {len(body.get('notifications') or [])} notifications...")
+        return success_response(dispatch_notification_batch(body.get('notifications')), is_api=False)
+
+    notification_type = resolve_notification_type(event, body)
+    log.info(f"Dispatching {notification_type} notification...")
+
+    result = dispatch_notification(notification_type, body)
+    return success_response({"type": notification_type, **result}, is_api=False)
@@ -0,0 +1,57 @@
+"""
+POST /rule/vote - Record a Vote on a Rule Proposal
+Each vote is one atomic update on the rule proposals table; voting twice returns 409.
+
+The voter is the caller - their user id comes from the authorizer context
+(requestContext.authorizer.user_id), never from the body. Requests without a
+caller identity, or with a body user_id naming someone else, get 401. The name
+shown in the accept/deny emails is the caller's Sleeper display name; a body
+display_name is ignored.
+
+Expected body:
+{
+    "proposal_id": "a1b2c3",
+    "vote": "approve"        ("approve" or "reject")
+}
+
+Returns the updated tally:
+{
+    "proposal_id": "a1b2c3",
+    "proposal": { ... },
+    "approved_by": ["Dom"],
+    "rejected_by": [],
+    "approve_count": 1,
+    "reject_count": 0
+}
+"""
+from lambdas.common.logger import get_logger
+from lambdas.common.errors import handle_errors, AuthorizationError
+from lambdas.common.utility_helpers import success_response, parse_body, require_fields, get_caller_id
+from lambdas.common.rule_helpers import get_voter_display_name, record_vote
+
+log = get_logger(__file__)
+
+HANDLER = 'rule_vote'
+
+
+@handle_errors(HANDLER)
+def handler(event, context):
+    log.info("Starting Rule Vote...")
+    body = parse_body(event)
+    require_fields(body, 'proposal_id', 'vote')
+
+    user_id = get_caller_id(event)
+    if not user_id:
+        raise AuthorizationError("Votes need a caller identity from the authorizer", HANDLER, 'handler')
+    if body.get('user_id') and body['user_id'] != user_id:
+        raise AuthorizationError("Cannot vote as another user", HANDLER, 'handler')
+
+    tally = record_vote(
+        proposal_id=body['proposal_id'],
+        user_id=user_id,
+        vote=body['vote'],
+        display_name=get_voter_display_name(user_id),
+    )
+    log.info(f"Proposal {tally['proposal_id']}: {tally['approve_count']} yes, {tally['reject_count']} no.")
+
+    return success_response(tally, is_api=False)
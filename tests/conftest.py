@@ -0,0 +1,43 @@
+"""
+Shared test setup: fake AWS config (constants.py reads it at import) and a
+moto-backed AWS for every test.
+"""
+
+import os
+import sys
+
+import boto3
+import pytest
+from moto import mock_aws
+
+os.environ.setdefault('AWS_ACCOUNT_ID', '123456789012')
+os.environ.setdefault('DYNAMODB_KMS_ALIAS', 'alias/test')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('CURSOR_SECRET_KEY', 'test-cursor-secret')
+os.environ.setdefault('SLEEPER_CACHE_TABLE_ENABLED', 'false')
+os.environ.setdefault('PREWARM_ENABLED', 'false')
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture(autouse=True)
+def aws():
+    with mock_aws():
+        yield
+
+
+def create_table(name: str, key: str, key_type: str = 'S', **kwargs):
+    """On-demand table with a single hash key (extra create_table kwargs pass through)."""
+    client = boto3.client('dynamodb', region_name=os.environ['AWS_DEFAULT_REGION'])
+    key_schema = kwargs.pop('KeySchema', [{'AttributeName': key, 'KeyType': 'HASH'}])
+    attributes = kwargs.pop('AttributeDefinitions', [{'AttributeName': key, 'AttributeType': key_type}])
+    client.create_table(
+        TableName=name,
+        KeySchema=key_schema,
+        AttributeDefinitions=attributes,
+        BillingMode='PAY_PER_REQUEST',
+        **kwargs
+    )
+    return client
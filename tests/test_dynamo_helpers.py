@@ -0,0 +1,446 @@
+from decimal import Decimal
+
+import boto3
+import pytest
+
+from conftest import create_table
+from lambdas.common import dynamo_helpers
+from lambdas.common.constants import DYNAMODB_KMS_ALIAS
+from lambdas.common.errors import ConflictError, NotFoundError
+
+
+@pytest.fixture(autouse=True)
+def kms_alias():
+    kms = boto3.client('kms')
+    key_id = kms.create_key()['KeyMetadata']['KeyId']
+    kms.create_alias(AliasName=DYNAMODB_KMS_ALIAS, TargetKeyId=key_id)
+
+
+@pytest.fixture(autouse=True)
+def fresh_alias_cache(monkeypatch):
+    monkeypatch.setattr(dynamo_helpers, 'ALIASED_TABLES', frozenset({'live'}))
+    monkeypatch.setattr(dynamo_helpers, '_alias_table_missing', False)
+    dynamo_helpers._alias_cache.clear()
+    yield
+    dynamo_helpers._alias_cache.clear()
+
+
+def _tables_called(fn) -> dict:
+    from types import SimpleNamespace
+    from lambdas.common import metrics
+
+    metrics.begin_invocation('test', 'handler', SimpleNamespace(aws_request_id='req'))
+    fn()
+    return metrics.get_invocation_metrics()['tables']
+
+
+# ============================================
+# Rank Index
+# ============================================
+
+@pytest.fixture
+def ranked_table():
+    create_table('ranked', 'item_id')
+    dynamo_helpers.create_rank_index_table('ranked')
+    return 'ranked'
+
+
+def _rank_rows(table_name: str) -> set:
+    rows = dynamo_helpers.full_table_scan(dynamo_helpers.get_rank_index_table_name(table_name))
+    return {(row['goal_filter'], row['item_id'], int(row['rank'])) for row in rows}
+
+
+def test_rank_rows_follow_item_writes(ranked_table):
+    dynamo_helpers.update_ranked_item(ranked_table, 'item_id', {'item_id': 'a', 'rank_dict': {'speed': 2, 'power': 1}})
+    dynamo_helpers.update_ranked_item(ranked_table, 'item_id', {'item_id': 'a', 'rank_dict': {'speed': 3}})
+    assert _rank_rows(ranked_table) == {('speed', 'a', 3)}
+
+    dynamo_helpers.delete_ranked_item(ranked_table, 'item_id', 'a')
+    assert _rank_rows(ranked_table) == set()
+    assert dynamo_helpers.get_item_by_key(ranked_table, 'item_id', 'a', override=True) == {}
+
+
+def test_failed_rank_write_leaves_item_untouched(ranked_table):
+    dynamo_helpers.update_ranked_item(ranked_table, 'item_id', {'item_id': 'a', 'name': 'old', 'rank_dict': {'speed': 1}})
+    # The rank row writes fail (index table gone) - the item put must not land without them
+    boto3.client('dynamodb').delete_table(TableName=dynamo_helpers.get_rank_index_table_name(ranked_table))
+    with pytest.raises(Exception):
+        dynamo_helpers.update_ranked_item(ranked_table, 'item_id', {'item_id': 'a', 'name': 'new', 'rank_dict': {'speed': 2}})
+
+    assert dynamo_helpers.get_item_by_key(ranked_table, 'item_id', 'a')['name'] == 'old'
+
+
+def test_rank_index_uses_numeric_hash_key():
+    create_table('numbered', 'item_id', 'N')
+    dynamo_helpers.create_rank_index_table('numbered')
+    dynamo_helpers.update_ranked_item('numbered', 'item_id', {'item_id': 7, 'rank_dict': {'speed': 1}})
+
+    assert dynamo_helpers.query_top_ranked('numbered', 'speed', 5) == [{'item_id': Decimal(7), 'rank': Decimal(1)}]
+
+
+def test_table_scan_by_ids_returns_index_order(ranked_table):
+    for item_id, rank in (('a', 3), ('b', 1), ('c', 2), ('d', 4)):
+        dynamo_helpers.update_ranked_item(ranked_table, 'item_id', {'item_id': item_id, 'rank_dict': {'speed': rank}})
+    dynamo_helpers.update_table_item(ranked_table, {'item_id': 'e'})
+
+    data = dynamo_helpers.table_scan_by_ids(ranked_table, 'item_id', ['a', 'b', 'c', 'e'], 'speed', use_rank_index=True)
+    assert [item['item_id'] for item in data] == ['b', 'c', 'a', 'e']
+    assert [item.get('rank') for item in data] == [1, 2, 3, None]
+
+    data = dynamo_helpers.table_scan_by_ids(ranked_table, 'item_id', ['a', 'b', 'c'], 'speed', use_rank_index=True, is_reverse=True)
+    assert [item['item_id'] for item in data] == ['a', 'c', 'b']
+
+
+def test_table_scan_by_ids_reads_only_the_requested_rank_rows(ranked_table):
+    for rank in range(30):
+        dynamo_helpers.update_ranked_item(ranked_table, 'item_id', {'item_id': f"i{rank}", 'rank_dict': {'speed': rank}})
+
+    tables = _tables_called(lambda: dynamo_helpers.table_scan_by_ids(ranked_table, 'item_id', ['i7', 'i3'], 'speed', use_rank_index=True))
+    rank_calls = tables[dynamo_helpers.get_rank_index_table_name(ranked_table)]
+    assert list(rank_calls) == ['BatchGetItem'] and rank_calls['BatchGetItem']['items'] == 2
+
+
+# ============================================
+# Conditional Writes
+# ============================================
+
+def test_missing_items_raise_not_found():
+    create_table('users', 'user_id')
+    with pytest.raises(NotFoundError):
+        dynamo_helpers.update_table_item_field('users', 'user_id', 'nobody', 'email', 'x@x.com')
+    with pytest.raises(NotFoundError):
+        dynamo_helpers.delete_table_item('users', 'user_id', 'nobody')
+    with pytest.raises(NotFoundError):
+        dynamo_helpers.update_table_item_field('users', 'user_id', 'nobody', 'email', 'x@x.com', expected_version=0)
+    # The conditions never create the item
+    assert dynamo_helpers.full_table_scan('users') == []
+
+
+def test_stale_versions_raise_conflict():
+    create_table('users', 'user_id')
+    dynamo_helpers.update_table_item('users', {'user_id': '1', 'email': 'a@x.com'}, expected_version=0)
+    with pytest.raises(ConflictError):
+        dynamo_helpers.update_table_item('users', {'user_id': '1', 'email': 'b@x.com'}, expected_version=0)
+
+    dynamo_helpers.update_table_item_field('users', 'user_id', '1', 'email', 'c@x.com', expected_version=1)
+    with pytest.raises(ConflictError):
+        dynamo_helpers.update_table_item_field('users', 'user_id', '1', 'email', 'd@x.com', expected_version=1)
+    with pytest.raises(ConflictError):
+        dynamo_helpers.delete_table_item('users', 'user_id', '1', expected_version=1)
+
+    item = dynamo_helpers.get_item_by_key('users', 'user_id', '1')
+    assert (item['email'], item[dynamo_helpers.LOCK_VERSION_ATTRIBUTE]) == ('c@x.com', 2)
+    dynamo_helpers.delete_table_item('users', 'user_id', '1', expected_version=2)
+    assert dynamo_helpers.full_table_scan('users') == []
+
+
+# ============================================
+# Bulk Writer
+# ============================================
+
+class _ThrottlingClient:
+    """Real client whose first `throttled` batch writes only land half their items."""
+
+    def __init__(self, client, throttled: int = 1):
+        self._client = client
+        self.throttled = throttled
+        self.batch_calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        self.batch_calls += 1
+        if self.batch_calls > self.throttled:
+            return self._client.batch_write_item(RequestItems=RequestItems, **kwargs)
+        (table_name, requests), = RequestItems.items()
+        half = len(requests) // 2
+        if half:
+            self._client.batch_write_item(RequestItems={table_name: requests[:half]})
+        return {'UnprocessedItems': {table_name: requests[half:]}}
+
+
+def test_bulk_write_dedupes_keys_and_retries_unprocessed_items(monkeypatch):
+    create_table('players', 'player_id')
+    client = _ThrottlingClient(dynamo_helpers.dynamodb_client.get())
+    monkeypatch.setattr(dynamo_helpers, 'dynamodb_client', client)
+    monkeypatch.setattr(dynamo_helpers, '_batch_backoff', lambda attempt: None)
+
+    # One 25-item batch's worth of writes, every key twice
+    items = ({'player_id': str(index % 12), 'version': index} for index in range(24))
+    stats = dynamo_helpers.bulk_write_items('players', items, shards=1)
+
+    assert (stats['items'], stats['duplicates'], stats['retries']) == (12, 12, 1)
+    assert client.batch_calls == 2
+    stored = {item['player_id']: item['version'] for item in dynamo_helpers.full_table_scan('players')}
+    # Last write wins for repeated keys
+    assert stored == {str(index % 12): index for index in range(12, 24)}
+
+
+def test_bulk_write_gives_up_after_max_retries(monkeypatch):
+    create_table('players', 'player_id')
+    monkeypatch.setattr(dynamo_helpers, 'dynamodb_client', _ThrottlingClient(dynamo_helpers.dynamodb_client.get(), throttled=100))
+    monkeypatch.setattr(dynamo_helpers, '_batch_backoff', lambda attempt: None)
+
+    with pytest.raises(Exception, match='unprocessed'):
+        dynamo_helpers.bulk_write_items('players', ({'player_id': str(index)} for index in range(200)), shards=2)
+
+
+# ============================================
+# Export / Import
+# ============================================
+
+def test_export_import_round_trip(tmp_path):
+    from boto3.dynamodb.types import Binary
+
+    create_table('players', 'player_id')
+    big = {'stats': [{'week': week, 'fpts': Decimal('10.5')} for week in range(60)]}
+    dynamo_helpers.update_table_item('players', {'player_id': '1', 'data': big, 'avatar': Binary(b'\x00\xffpng')}, compress=True)
+    dynamo_helpers.update_table_item('players', {'player_id': '2', 'tags': {'wr', 'rookie'}, 'ids': [1, Decimal('2.5')], 'active': True, 'note': None})
+    path = str(tmp_path / 'players.jsonl.gz')
+
+    assert dynamo_helpers.export_table('players', path, total_segments=2)['items'] == 2
+    create_table('players-copy', 'player_id')
+    assert dynamo_helpers.import_table('players-copy', path)['items'] == 2
+
+    raw = boto3.client('dynamodb')
+    for player_id in ('1', '2'):
+        key = {'player_id': {'S': player_id}}
+        assert raw.get_item(TableName='players-copy', Key=key)['Item'] == raw.get_item(TableName='players', Key=key)['Item']
+    copied = dynamo_helpers.get_item_by_key('players-copy', 'player_id', '1')
+    assert copied['data'] == big and copied['avatar'] == Binary(b'\x00\xffpng')
+
+
+# ============================================
+# Item Cache
+# ============================================
+
+def test_item_cache_drops_reads_that_raced_a_write(monkeypatch):
+    create_table('users', 'user_id')
+    monkeypatch.setitem(dynamo_helpers._item_caches, 'users', dynamo_helpers.ItemCache(16, 60))
+    dynamo_helpers.update_table_item('users', {'user_id': '1', 'email': 'old@x.com'})
+    decode = dynamo_helpers.decode_item_attributes
+    raced = []
+
+    def write_during_read(item, fast=False):
+        # The read already has the old item; a write lands before it is cached
+        if not raced:
+            raced.append(True)
+            dynamo_helpers.update_table_item('users', {'user_id': '1', 'email': 'new@x.com'})
+        return decode(item, fast)
+
+    monkeypatch.setattr(dynamo_helpers, 'decode_item_attributes', write_during_read)
+    assert dynamo_helpers.get_item_by_key('users', 'user_id', '1')['email'] == 'old@x.com'
+    assert dynamo_helpers.get_item_by_key('users', 'user_id', '1')['email'] == 'new@x.com'
+
+
+# ============================================
+# Metrics
+# ============================================
+
+def test_paginated_query_is_one_call_over_several_pages():
+    create_table(
+        'weeks', None,
+        KeySchema=[{'AttributeName': 'league_id', 'KeyType': 'HASH'}, {'AttributeName': 'week', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[{'AttributeName': 'league_id', 'AttributeType': 'S'}, {'AttributeName': 'week', 'AttributeType': 'N'}],
+    )
+    for week in range(5):
+        dynamo_helpers.update_table_item('weeks', {'league_id': '1', 'week': week})
+
+    tables = _tables_called(lambda: list(dynamo_helpers.iter_query('weeks', 'league_id', '1', Limit=2)))
+    query = tables['weeks']['Query']
+    assert query['calls'] == 1 and query['pages'] >= 3 and query['items'] == 5
+
+
+# ============================================
+# Incremental Sync
+# ============================================
+
+def _players(count: int, **overrides) -> dict:
+    return {str(index): {'name': f"Player {index}", 'team': 'LAR', **overrides.get(str(index), {})} for index in range(count)}
+
+
+def test_sync_counts_unchanged_changed_added_and_removed():
+    create_table('players', 'player_id')
+    assert dynamo_helpers.sync_table_items('players', _players(20)) == {'unchanged': 0, 'changed': 0, 'added': 20, 'removed': 0}
+
+    source = _players(21, **{'3': {'team': 'SF'}})
+    del source['5']
+    counts = dynamo_helpers.sync_table_items('players', source)
+
+    assert counts == {'unchanged': 18, 'changed': 1, 'added': 1, 'removed': 1}
+    stored = {item['player_id']: item['data'] for item in dynamo_helpers.full_table_scan('players')}
+    assert stored == source
+
+
+def test_sync_refuses_to_empty_the_table():
+    create_table('players', 'player_id')
+    dynamo_helpers.sync_table_items('players', _players(20))
+
+    for truncated in ({}, _players(10)):
+        with pytest.raises(Exception, match='Refusing'):
+            dynamo_helpers.sync_table_items('players', truncated)
+    assert len(dynamo_helpers.full_table_scan('players')) == 20
+
+    assert dynamo_helpers.sync_table_items('players', _players(10), force=True)['removed'] == 10
+    assert dynamo_helpers.sync_table_items('players', {}, delete_missing=False)['removed'] == 0
+
+
+# ============================================
+# Payload Codec
+# ============================================
+
+def test_codec_attributes_decode_on_every_read_helper():
+    create_table('players', 'player_id')
+    data = {'first_name': 'Puka', 'stats': [{'week': week, 'fpts': 12.5} for week in range(60)]}
+    dynamo_helpers.update_table_item('players', {'player_id': '1', 'data': data}, compress=True)
+
+    stored = boto3.client('dynamodb').get_item(TableName='players', Key={'player_id': {'S': '1'}})['Item']
+    assert 'B' in stored['data']
+    assert dynamo_helpers.get_item_by_key('players', 'player_id', '1')['data'] == data
+    assert dynamo_helpers.query_table_by_key('players', 'player_id', '1')['Items'][0]['data'] == data
+    assert dynamo_helpers.full_table_scan('players')[0]['data'] == data
+
+
+# ============================================
+# Pagination
+# ============================================
+
+def test_pages_through_binary_range_keys():
+    create_table(
+        'blobs', None,
+        KeySchema=[{'AttributeName': 'league_id', 'KeyType': 'HASH'}, {'AttributeName': 'digest', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[{'AttributeName': 'league_id', 'AttributeType': 'S'}, {'AttributeName': 'digest', 'AttributeType': 'B'}],
+    )
+    for index in range(5):
+        dynamo_helpers.update_table_item('blobs', {'league_id': '1', 'digest': bytes([index, 255])})
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = dynamo_helpers.query_table_page('blobs', 'league_id', '1', 2, cursor, ascending=True)
+        seen += [item['digest'].value for item in items]
+        if not cursor:
+            break
+    assert seen == [bytes([index, 255]) for index in range(5)]
+
+
+def test_cursor_key_is_derived_from_the_jwt_secret(monkeypatch):
+    import hashlib
+    import hmac
+    from lambdas.common import ssm_helpers, utility_helpers
+
+    boto3.client('ssm').put_parameter(Name=ssm_helpers._PARAMETERS['API_SECRET_KEY'], Value='jwt-secret', Type='SecureString')
+    monkeypatch.setattr(utility_helpers, 'CURSOR_SECRET_KEY', None)
+    # Fetched (and cached on the module) fresh, and dropped again afterwards
+    monkeypatch.setitem(vars(ssm_helpers), 'API_SECRET_KEY', None)
+    monkeypatch.delitem(vars(ssm_helpers), 'API_SECRET_KEY')
+    assert utility_helpers._cursor_secret() == hmac.new(b'jwt-secret', b'cursor', hashlib.sha256).digest()
+
+
+# ============================================
+# Table Resets
+# ============================================
+
+@pytest.fixture
+def live_table():
+    """Table as infrastructure-as-code would create it: composite key, LSI, stream and TTL."""
+    client = create_table(
+        'live', None,
+        KeySchema=[{'AttributeName': 'league_id', 'KeyType': 'HASH'}, {'AttributeName': 'week', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'league_id', 'AttributeType': 'S'},
+            {'AttributeName': 'week', 'AttributeType': 'N'},
+            {'AttributeName': 'points', 'AttributeType': 'N'},
+        ],
+        LocalSecondaryIndexes=[{
+            'IndexName': 'points-index',
+            'KeySchema': [{'AttributeName': 'league_id', 'KeyType': 'HASH'}, {'AttributeName': 'points', 'KeyType': 'RANGE'}],
+            'Projection': {'ProjectionType': 'KEYS_ONLY'},
+        }],
+        StreamSpecification={'StreamEnabled': True, 'StreamViewType': 'NEW_AND_OLD_IMAGES'},
+    )
+    client.update_time_to_live(TableName='live', TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'})
+    dynamo_helpers.update_table_item('live', {'league_id': '1', 'week': 1, 'points': 100})
+    return 'live'
+
+
+@pytest.fixture
+def alias_table():
+    create_table(dynamo_helpers.TABLE_ALIASES_TABLE_NAME, 'alias')
+
+
+def _table_exists(name: str) -> bool:
+    return name in boto3.client('dynamodb').list_tables()['TableNames']
+
+
+def test_empty_table_works_without_alias_table():
+    create_table('players', 'player_id')
+    dynamo_helpers.update_table_item('players', {'player_id': '1'})
+
+    dynamo_helpers.emptyTable('players', 'player_id', 'S')
+    assert dynamo_helpers.full_table_scan('players') == []
+
+
+def test_only_aliased_tables_are_resolved():
+    create_table('players', 'player_id')
+    tables = _tables_called(lambda: dynamo_helpers.get_item_by_key('players', 'player_id', '1', override=True))
+    assert list(tables) == ['players']
+
+
+def test_missing_alias_table_is_looked_up_once(live_table):
+    # The fixture's write already found no alias table
+    dynamo_helpers._alias_cache.clear()
+    tables = _tables_called(lambda: dynamo_helpers.full_table_scan('live'))
+    assert list(tables) == ['live']
+
+
+def test_versioned_reset_requires_opt_in(alias_table):
+    create_table('players', 'player_id')
+    with pytest.raises(Exception, match='ALIASED_TABLES'):
+        dynamo_helpers.reset_table_versioned('players')
+    assert not _table_exists('players-v1')
+
+
+def test_versioned_reset_requires_alias_table(live_table):
+    with pytest.raises(Exception, match='table-aliases'):
+        dynamo_helpers.reset_table_versioned(live_table)
+    assert not _table_exists('live-v1')
+
+
+def test_versioned_reset_copies_table_config(live_table, alias_table):
+    dynamo_helpers.reset_table_versioned(live_table, items=[{'league_id': '2', 'week': 3, 'points': 50}])
+
+    client = boto3.client('dynamodb')
+    old, new = (client.describe_table(TableName=name)['Table'] for name in ('live', 'live-v1'))
+    assert new['KeySchema'] == old['KeySchema']
+    assert [index['IndexName'] for index in new['LocalSecondaryIndexes']] == ['points-index']
+    assert new['StreamSpecification'] == old['StreamSpecification']
+    assert client.describe_time_to_live(TableName='live-v1')['TimeToLiveDescription'] == {
+        'TimeToLiveStatus': 'ENABLED', 'AttributeName': 'expires_at'
+    }
+
+    # Reads follow the alias; version 0 is left alone
+    assert dynamo_helpers.resolve_table_name('live') == 'live-v1'
+    assert dynamo_helpers.full_table_scan('live') == [{'league_id': '2', 'week': 3, 'points': 50}]
+    assert _table_exists('live')
+
+
+def test_versioned_reset_drops_retired_versions_but_never_version_zero(live_table, alias_table, monkeypatch):
+    monkeypatch.setattr(dynamo_helpers, 'TABLE_ALIAS_DROP_GRACE_SECONDS', 0)
+    for _ in range(3):
+        dynamo_helpers.reset_table_versioned(live_table)
+
+    assert _table_exists('live')
+    assert not _table_exists('live-v1')
+    assert _table_exists('live-v2') and _table_exists('live-v3')
+    assert dynamo_helpers.resolve_table_name('live') == 'live-v3'
+
+
+def test_versioned_reset_waits_out_alias_cache_grace(live_table, alias_table):
+    dynamo_helpers.reset_table_versioned(live_table)
+    dynamo_helpers.reset_table_versioned(live_table)  # retires v1, grace period starts
+
+    with pytest.raises(Exception, match='between resets'):
+        dynamo_helpers.reset_table_versioned(live_table)
+    assert _table_exists('live-v1')
+    assert not dynamo_helpers.drop_retired_table(live_table)
@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import create_table
+from lambdas.common import notifications
+from lambdas.common.constants import RULE_PROPOSALS_TABLE_NAME
+from lambdas.common.dynamo_helpers import full_table_scan
+from lambdas.notification_dispatch.handler import handler
+
+PROPOSAL = {'title': 'IR stash', 'description': 'Two IR spots'}
+
+
+@pytest.fixture(autouse=True)
+def sent(monkeypatch):
+    """Emails handed to SES, in send order (every send succeeds)."""
+    sent = []
+
+    def send_all(tasks):
+        sent.extend(tasks)
+        return [True] * len(tasks)
+
+    monkeypatch.setattr(notifications, 'send_emails_with_results', send_all)
+    monkeypatch.setattr(notifications, 'send_emails_concurrently', lambda tasks: (len(send_all(tasks)), 0))
+    return sent
+
+
+@pytest.fixture
+def proposals_table():
+    create_table(RULE_PROPOSALS_TABLE_NAME, 'proposal_id')
+
+
+def dispatch(path: str, body: dict) -> tuple:
+    response = handler({'resource': path, 'body': json.dumps(body)}, None)
+    body = response['body']
+    return response['statusCode'], json.loads(body) if isinstance(body, str) else body
+
+
+# ============================================
+# Rule Proposals
+# ============================================
+
+def test_validating_a_proposal_stores_nothing(proposals_table):
+    notifications.validate_rule_proposal({'proposal_id': 'p1', 'proposal': PROPOSAL, 'recipients': ['a@x.com']})
+    assert full_table_scan(RULE_PROPOSALS_TABLE_NAME) == []
+
+
+def test_retried_proposal_is_stored_once_and_sent_again(proposals_table, sent):
+    body = {'proposal_id': 'p1', 'proposal': PROPOSAL, 'recipients': ['a@x.com', 'b@x.com']}
+    for _ in range(2):
+        status, result = dispatch('/email/rule-proposal', body)
+        assert status == 200 and result['successfulEmails'] == 2
+
+    assert [row['proposal_id'] for row in full_table_scan(RULE_PROPOSALS_TABLE_NAME)] == ['p1']
+    assert len(sent) == 4
+
+
+def test_reused_proposal_id_with_new_content_conflicts_before_sending(proposals_table, sent):
+    dispatch('/email/rule-proposal', {'proposal_id': 'p1', 'proposal': PROPOSAL, 'recipients': ['a@x.com']})
+    status, _ = dispatch('/email/rule-proposal', {'proposal_id': 'p1', 'proposal': {'title': 'Other'}, 'recipients': ['a@x.com']})
+
+    assert status == 409
+    assert len(sent) == 1
+    assert full_table_scan(RULE_PROPOSALS_TABLE_NAME)[0]['proposal'] == PROPOSAL
+
+
+def test_bad_proposal_is_not_stored(proposals_table):
+    status, _ = dispatch('/email/rule-proposal', {'proposal_id': 'p1', 'proposal': PROPOSAL})
+    assert status == 400
+    assert full_table_scan(RULE_PROPOSALS_TABLE_NAME) == []
+
+
+# ============================================
+# Prewarm
+# ============================================
+
+@pytest.mark.parametrize('module, expected', [
+    ('lambdas.email_rule_deny.handler', ['ses_client']),
+    ('lambdas.email_taxi.handler', ['ses_client', 'taxi_resolver']),
+    ('lambdas.notification_dispatch.handler', ['ses_client', 'taxi_resolver']),
+])
+def test_taxi_resolver_prewarms_only_where_taxi_steals_are_served(module, expected):
+    # Fresh interpreter - registration happens at import
+    script = (
+        f"import sys; sys.path.insert(0, 'tests'); import conftest, {module}; "
+        "from lambdas.common.prewarm import get_prewarm_status; print(sorted(get_prewarm_status()))"
+    )
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    output = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == str(expected)
+
+
+# ============================================
+# Batches
+# ============================================
+
+TAXI_STEAL = {
+    'type': 'taxi_steal',
+    'stealer': {'display_name': 'Dom'},
+    'player': {'first_name': 'Puka', 'last_name': 'Nacua', 'position': 'WR', 'team': 'LAR'},
+    'owner': {'display_name': 'Sam', 'email': 'owner@x.com'},
+    'recipients': ['a@x.com'],
+    'league_name': 'Xomper',
+}
+RULE_ACCEPT = {'type': 'rule_accept', 'proposal': PROPOSAL, 'approved_by': ['Dom'], 'rejected_by': [], 'recipients': ['a@x.com', 'b@x.com']}
+
+
+def test_malformed_events_fail_alone(sent, monkeypatch):
+    def broken_builder(payload):
+        raise RuntimeError('template blew up')
+
+    monkeypatch.setattr(notifications.get_notification_type('rule_deny'), 'content_builder', broken_builder)
+    status, result = dispatch('/email/batch', {'notifications': [
+        {**TAXI_STEAL, 'player': 'p'},
+        {**RULE_ACCEPT, 'recipients': 'a@x.com'},
+        {**RULE_ACCEPT, 'type': 'rule_deny'},
+        'not an object',
+        {'type': 'nope'},
+        TAXI_STEAL,
+    ]})
+
+    assert status == 200
+    assert [r['status'] for r in result['results']] == [400, 400, 500, 400, 400, 200]
+    assert result['results'][0]['error']['field'] == 'player'
+    assert result['results'][2]['error']['message'] == 'template blew up'
+    assert result['results'][5]['successfulEmails'] == 2
+    assert sorted(task[0] for task in sent) == ['a@x.com', 'owner@x.com']
+
+
+def test_digest_recipients_get_one_copy(sent):
+    status, result = dispatch('/email/batch', {'notifications': [
+        RULE_ACCEPT,
+        {**RULE_ACCEPT, 'recipients': ['b@x.com', 'c@x.com']},
+        TAXI_STEAL,
+        TAXI_STEAL,
+    ]})
+
+    assert status == 200
+    assert [(r['successfulEmails'], r['deduplicatedEmails']) for r in result['results']] == [(2, 0), (1, 1), (2, 0), (2, 0)]
+    # Rule emails are digested, taxi steal alerts are not
+    assert sorted(task[0] for task in sent) == ['a@x.com', 'a@x.com', 'a@x.com', 'b@x.com', 'c@x.com', 'owner@x.com', 'owner@x.com']
+    assert result['successfulEmails'] == 7
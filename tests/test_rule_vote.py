@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from conftest import create_table
+from lambdas.common.constants import RULE_PROPOSALS_TABLE_NAME
+from lambdas.common.rule_helpers import create_rule_proposal, get_vote_tally
+from lambdas.rule_vote.handler import handler
+
+
+@pytest.fixture(autouse=True)
+def sleeper_users(monkeypatch):
+    from lambdas.common import sleeper_helper
+
+    users = {'u1': {'user_id': 'u1', 'display_name': 'Dom'}}
+    monkeypatch.setattr(sleeper_helper, 'get_sleeper_user', lambda user_id: users.get(user_id))
+
+
+@pytest.fixture(autouse=True)
+def proposal():
+    create_table(RULE_PROPOSALS_TABLE_NAME, 'proposal_id')
+    create_rule_proposal('p1', {'title': 'IR stash'})
+
+
+def vote(body: dict, caller_id: str = None) -> tuple:
+    event = {'body': json.dumps(body)}
+    if caller_id:
+        event['requestContext'] = {'authorizer': {'user_id': caller_id}}
+    response = handler(event, None)
+    body = response['body']
+    return response['statusCode'], json.loads(body) if isinstance(body, str) else body
+
+
+def test_vote_is_recorded_for_the_caller():
+    status, tally = vote({'proposal_id': 'p1', 'vote': 'approve', 'display_name': 'Steve'}, caller_id='u1')
+
+    assert status == 200
+    # Shown under their own Sleeper name, whatever the body claims
+    assert tally['approved_by'] == ['Dom']
+    assert (tally['approve_count'], tally['reject_count']) == (1, 0)
+
+
+def test_unknown_sleeper_user_is_shown_by_id():
+    assert vote({'proposal_id': 'p1', 'vote': 'reject'}, caller_id='u9')[1]['rejected_by'] == ['u9']
+
+
+@pytest.mark.parametrize('second_vote', ['approve', 'reject'])
+def test_second_vote_from_same_user_conflicts(second_vote):
+    vote({'proposal_id': 'p1', 'vote': 'approve'}, caller_id='u1')
+    status, body = vote({'proposal_id': 'p1', 'vote': second_vote}, caller_id='u1')
+
+    assert status == 409
+    tally = get_vote_tally('p1')
+    assert (tally['approve_count'], tally['reject_count']) == (1, 0)
+
+
+def test_votes_need_a_caller_identity():
+    assert vote({'proposal_id': 'p1', 'vote': 'approve', 'user_id': 'u1'})[0] == 401
+    assert get_vote_tally('p1')['approve_count'] == 0
+
+
+def test_cannot_vote_as_another_user():
+    assert vote({'proposal_id': 'p1', 'vote': 'approve', 'user_id': 'u2'}, caller_id='u1')[0] == 401
+
+
+def test_unknown_proposal_and_bad_vote():
+    assert vote({'proposal_id': 'missing', 'vote': 'approve'}, caller_id='u1')[0] == 404
+    assert vote({'proposal_id': 'p1', 'vote': 'maybe'}, caller_id='u1')[0] == 400
+
+
+def test_repeat_votes_are_all_counted_once():
+    # Sequential on purpose - moto doesn't serialize writes to one item the way DynamoDB does
+    voters = [f"u{i}" for i in range(12)]
+    statuses = [vote({'proposal_id': 'p1', 'vote': 'reject'}, caller_id=user_id)[0] for user_id in voters + voters[:4]]
+
+    assert statuses.count(200) == 12 and statuses.count(409) == 4
+    assert get_vote_tally('p1')['reject_count'] == 12
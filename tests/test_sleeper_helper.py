@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from lambdas.common import sleeper_helper
+
+LEAGUE_URL = f"{sleeper_helper.SLEEPER_URL_BASE}/league/1"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(sleeper_helper, 'SLEEPER_CACHE', sleeper_helper.SleeperCache(16))
+    monkeypatch.setattr(sleeper_helper, 'SLEEPER_SINGLE_FLIGHT', sleeper_helper.SingleFlight())
+
+
+def test_concurrent_callers_share_one_fetch(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_request(url, function):
+        calls.append(url)
+        release.wait(5)
+        return {"name": "league"}
+
+    monkeypatch.setattr(sleeper_helper, '_request_json', fake_request)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(sleeper_helper._cached_fetch_json(LEAGUE_URL, 'test', 'league')))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while sleeper_helper.SLEEPER_SINGLE_FLIGHT.metrics()["coalescedCalls"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [LEAGUE_URL]
+    assert results == [{"name": "league"}] * 4
+
+
+def test_invalidation_during_fetch_is_not_overwritten(monkeypatch):
+    """A caller arriving after invalidate() must not join (and cache) the pre-invalidation fetch."""
+    first_started = threading.Event()
+    release_first = threading.Event()
+    responses = iter([{"version": "old"}, {"version": "new"}])
+
+    def fake_request(url, function):
+        value = next(responses)
+        if value["version"] == "old":
+            first_started.set()
+            release_first.wait(5)
+        return value
+
+    monkeypatch.setattr(sleeper_helper, '_request_json', fake_request)
+    old_result = []
+    leader = threading.Thread(target=lambda: old_result.append(sleeper_helper._cached_fetch_json(LEAGUE_URL, 'test', 'league')))
+    leader.start()
+    assert first_started.wait(5)
+
+    sleeper_helper.invalidate_sleeper_cache(LEAGUE_URL)
+    # Starts its own fetch instead of waiting on the stale one
+    assert sleeper_helper._cached_fetch_json(LEAGUE_URL, 'test', 'league') == {"version": "new"}
+
+    release_first.set()
+    leader.join(5)
+    assert old_result == [{"version": "old"}]
+    value, state = sleeper_helper.SLEEPER_CACHE.lookup(LEAGUE_URL, 'league')
+    assert (value, state) == ({"version": "new"}, "fresh")
+
+
+def test_invalidate_matches_path_prefix_only():
+    cache = sleeper_helper.SLEEPER_CACHE
+    for url in (LEAGUE_URL, f"{LEAGUE_URL}/rosters", f"{LEAGUE_URL}2"):
+        cache.store(url, {}, 'league', cache.generation)
+
+    assert sleeper_helper.invalidate_sleeper_cache(LEAGUE_URL) == 2
+    assert cache.lookup(f"{LEAGUE_URL}2", 'league')[1] == "fresh"
+
+
+def test_shared_cache_round_trip_and_tombstone(monkeypatch):
+    from conftest import create_table
+    from lambdas.common.dynamo_helpers import get_item_by_key
+
+    create_table(sleeper_helper.SLEEPER_CACHE_TABLE_NAME, sleeper_helper.SLEEPER_L2_CACHE_KEY)
+    monkeypatch.setattr(sleeper_helper, 'SLEEPER_CACHE_TABLE_ENABLED', True)
+    rosters = [{"owner_id": "1", "settings": {"fpts": 101.5, "wins": 7}}]
+
+    sleeper_helper._l2_put(f"{LEAGUE_URL}/rosters", rosters, 300)
+    # Floats survive and numbers come back as int/float, not Decimal
+    assert sleeper_helper._l2_get(f"{LEAGUE_URL}/rosters") == rosters
+
+    before = int(time.time())
+    sleeper_helper.invalidate_league_cache('1')
+    assert sleeper_helper._l2_get(f"{LEAGUE_URL}/rosters") is sleeper_helper._MISS
+    tombstone = get_item_by_key(sleeper_helper.SLEEPER_CACHE_TABLE_NAME, sleeper_helper.SLEEPER_L2_CACHE_KEY, 'league/1/rosters')
+    # A recent timestamp - TTL skips anything more than 5 years in the past
+    assert before <= tombstone['expires_at'] <= time.time()
+
+
+def test_background_refresh_is_kept_out_of_the_next_invocation(monkeypatch):
+    from types import SimpleNamespace
+    from conftest import create_table
+    from lambdas.common import metrics
+
+    create_table(sleeper_helper.SLEEPER_CACHE_TABLE_NAME, sleeper_helper.SLEEPER_L2_CACHE_KEY)
+    monkeypatch.setattr(sleeper_helper, 'SLEEPER_CACHE_TABLE_ENABLED', True)
+    release = threading.Event()
+
+    def fake_request(url, function):
+        release.wait(5)
+        return {"name": "refreshed"}
+
+    monkeypatch.setattr(sleeper_helper, '_request_json', fake_request)
+    emitted = []
+    monkeypatch.setattr(metrics, '_emit', lambda collector: emitted.append(collector.snapshot()))
+    # Entry is past its ttl but inside the stale window
+    sleeper_helper.SLEEPER_CACHE.store(LEAGUE_URL, {"name": "stale"}, 'league', sleeper_helper.SLEEPER_CACHE.generation)
+    sleeper_helper.SLEEPER_CACHE._entries[LEAGUE_URL].fetched_at -= sleeper_helper.SLEEPER_CACHE_POLICIES['league']['ttl'] + 1
+
+    metrics.begin_invocation('first', 'handler', SimpleNamespace(aws_request_id='req-1'))
+    assert sleeper_helper._cached_fetch_json(LEAGUE_URL, 'test', 'league') == {"name": "stale"}
+
+    metrics.begin_invocation('second', 'handler', SimpleNamespace(aws_request_id='req-2'))
+    release.set()
+    deadline = time.monotonic() + 5
+    while not emitted and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert metrics.get_invocation_metrics()['tables'] == {}
+    assert emitted[0]['requestId'] == 'req-1' and emitted[0]['background'] is True
+    assert set(emitted[0]['tables'][sleeper_helper.SLEEPER_CACHE_TABLE_NAME]) == {'GetItem', 'PutItem'}